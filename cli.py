@@ -48,11 +48,12 @@ def check_health():
         
         config = get_config()
         checker = HealthChecker(config)
-        report = checker.run_all_checks()
+        report = checker.run_all_checks(use_cache=True)
         
         print(checker.format_report(report))
         
-        return report["summary"]["overall_status"] == "ok"
+        # Warnings (e.g. missing optional packages) do not fail the check
+        return report["summary"]["overall_status"] != "error"
         
     except Exception as e:
         print(f"❌ Health check failed: {e}")
@@ -125,23 +126,22 @@ def list_audio_devices():
         from utils.performance_monitor import AudioDeviceMonitor
         
         config = get_config()
-        monitor = AudioDeviceMonitor(config)
-        devices = monitor.get_audio_devices()
-        default_devices = monitor.get_default_devices()
+        with AudioDeviceMonitor(config) as monitor:
+            devices = monitor.get_audio_devices()
+            default_devices = monitor.get_default_devices()
         
         print(f"\n📥 Input Devices:")
         for device in devices:
-            if device['max_input_channels'] > 0:
-                default_mark = " (DEFAULT)" if default_devices['input'] and device['index'] == default_devices['input']['index'] else ""
-                print(f"  [{device['index']}] {device['name']}{default_mark}")
+            if device.max_input_channels > 0:
+                default_mark = " (DEFAULT)" if default_devices['input'] and device.index == default_devices['input']['index'] else ""
+                print(f"  [{device.index}] {device.name}{default_mark}")
                 
         print(f"\n📤 Output Devices:")
         for device in devices:
-            if device['max_output_channels'] > 0:
-                default_mark = " (DEFAULT)" if default_devices['output'] and device['index'] == default_devices['output']['index'] else ""
-                print(f"  [{device['index']}] {device['name']}{default_mark}")
+            if device.max_output_channels > 0:
+                default_mark = " (DEFAULT)" if default_devices['output'] and device.index == default_devices['output']['index'] else ""
+                print(f"  [{device.index}] {device.name}{default_mark}")
                 
-        monitor.cleanup()
         return True
         
     except Exception as e:
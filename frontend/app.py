@@ -18,6 +18,7 @@ from utils.text_to_speech import TextToSpeech
 from utils.audio_transcription import AudioTranscription
 from utils.system_monitor import SystemMonitor
 from utils.wake_word_detection import WakeWordDetection
+from utils.health_check import HealthChecker
 from helper.audio_processing import AudioProcessor
 
 app = Flask(__name__)
@@ -34,6 +35,7 @@ class VoiceAssistantAPI:
         self.stt = None
         self.wake_word = None
         self.system_monitor = SystemMonitor()
+        self.health_checker = HealthChecker(self.config)
         self.audio_processor = AudioProcessor(self.config)
         self.is_running = True
         self.start_time = datetime.now()
@@ -111,6 +113,22 @@ def status():
         }
     })
 
+@app.route('/health/live')
+def health_live():
+    """Liveness probe; runs no checks"""
+    result = api.health_checker.liveness()
+    return jsonify(result), 200
+
+@app.route('/health/ready')
+def health_ready():
+    """Readiness probe; 503 while any check reports an error"""
+    try:
+        result = api.health_checker.readiness()
+        return jsonify(result), 503 if result['status'] == 'error' else 200
+    except Exception as e:
+        logger.error(f"Readiness check failed: {e}")
+        return jsonify({'status': 'error', 'error': str(e)}), 503
+
 @app.route('/api/config')
 def get_config_endpoint():
     """Get current configuration"""
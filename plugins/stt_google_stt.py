@@ -94,6 +94,50 @@ def transcribe_live(duration=5, language="id"):
         return transcribe(audio_file, language)
     return None
 
+def stream_transcribe(frames, language="id", sample_rate=16000):
+    """
+    Transcribe audio frames while they are still being captured.
+    
+    Args:
+        frames (iterable): Mono LINEAR16 byte chunks
+        language (str): Language code
+        sample_rate (int): Sample rate of the frames in Hz
+        
+    Returns:
+        str: Transcribed text or None if failed
+    """
+    try:
+        from google.cloud import speech
+        
+        client = speech.SpeechClient()
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code=_get_google_language_code(language),
+            enable_automatic_punctuation=True,
+        )
+        streaming_config = speech.StreamingRecognitionConfig(config=config)
+        
+        # Requests are produced lazily, so recognition overlaps the recording
+        requests = (speech.StreamingRecognizeRequest(audio_content=chunk) for chunk in frames)
+        responses = client.streaming_recognize(streaming_config, requests)
+        
+        transcripts = [
+            result.alternatives[0].transcript
+            for response in responses
+            for result in response.results
+            if result.is_final
+        ]
+        transcript = " ".join(transcripts).strip()
+        logger.info(f"Streaming transcription result: {transcript}")
+        return transcript or None
+        
+    except ImportError:
+        raise ImportError("google-cloud-speech library not available. Install with: pip install google-cloud-speech")
+    except Exception as e:
+        logger.error(f"Google STT streaming transcription failed: {e}")
+        return None
+
 def transcribe_streaming(language="id", callback=None):
     """
     Real-time streaming transcription.
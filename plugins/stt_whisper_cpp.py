@@ -45,6 +45,10 @@ def _get_model():
     
     return _loaded_model
 
+def warmup():
+    """Load the Whisper model ahead of the first transcription."""
+    return _get_model() is not None
+
 def transcribe(audio_file=None, language="id"):
     """
     Transcribe audio file to text using OpenAI Whisper.
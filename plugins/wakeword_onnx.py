@@ -0,0 +1,220 @@
+"""
+ONNX Wake Word Detection Plugin
+Wake word detection with an open (e.g. openWakeWord-style) model run through ONNX Runtime
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 16000  # model input: the last second of audio
+FRAME_SAMPLES = 1280  # 80 ms hop between inferences
+DEFAULT_MODEL = "models/wakeword/wakeword_int8.onnx"  # override with WAKEWORD_ONNX_MODEL
+
+# Global variables
+_session = None
+_binding = None
+_input_buffer = None  # preallocated (1, 1, WINDOW_SAMPLES) float32, bound to the session input
+_threshold = 0.5
+_is_listening = False
+_wake_word_callback = None
+
+def initialize(keywords=None, sensitivity=0.5, model_path=None):
+    """
+    Initialize the ONNX wake word model.
+    
+    Args:
+        keywords (list): Wake words, in the order of the model's output scores
+        sensitivity (float): Detection sensitivity (0.0 to 1.0)
+        model_path (str): Path to the .onnx model (ideally int8, see quantize_model)
+    
+    Returns:
+        The inference session
+    """
+    global _session, _binding, _input_buffer, _threshold
+    
+    try:
+        import numpy as np
+        import onnxruntime as ort
+        
+        if model_path is None:
+            model_path = os.getenv('WAKEWORD_ONNX_MODEL', DEFAULT_MODEL)
+        if not Path(model_path).exists():
+            raise FileNotFoundError(f"Wake word model not found: {model_path}")
+        
+        logger.info(f"Initializing ONNX wake word model {model_path} with keywords: {keywords}")
+        
+        # One intra-op thread: the model is small and runs next to STT/TTS
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        _session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        
+        # Bind a single input array once; each frame is written into it in place
+        _input_buffer = np.zeros((1, 1, WINDOW_SAMPLES), dtype=np.float32)
+        _binding = _session.io_binding()
+        _binding.bind_cpu_input(_session.get_inputs()[0].name, _input_buffer)
+        _binding.bind_output(_session.get_outputs()[0].name)
+        
+        # Higher sensitivity means a lower score is enough to trigger
+        _threshold = 1.0 - max(0.0, min(1.0, sensitivity))
+        
+        logger.info("ONNX wake word model initialized successfully")
+        return _session
+    
+    except ImportError:
+        raise ImportError("onnxruntime library not available. Install with: pip install onnxruntime")
+    except Exception as e:
+        logger.error(f"Failed to initialize ONNX wake word model: {e}")
+        raise
+
+def start_listening(callback=None):
+    """
+    Start listening for wake words.
+    
+    Args:
+        callback (function): Function to call with the keyword index when a wake word is detected
+    """
+    global _is_listening, _wake_word_callback
+    
+    if _session is None:
+        raise RuntimeError("ONNX wake word model not initialized. Call initialize() first.")
+    
+    _wake_word_callback = callback
+    _is_listening = True
+    
+    # Start listening thread
+    listen_thread = threading.Thread(target=_listen_loop, daemon=True)
+    listen_thread.start()
+    
+    logger.info("Started listening for wake words")
+
+def stop_listening():
+    """Stop listening for wake words."""
+    global _is_listening
+    
+    _is_listening = False
+    logger.info("Stopped listening for wake words")
+
+def _listen_loop():
+    """Main listening loop."""
+    try:
+        import numpy as np
+        import pyaudio
+        
+        # Initialize audio stream
+        audio = pyaudio.PyAudio()
+        stream = audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=SAMPLE_RATE,
+            input=True,
+            frames_per_buffer=FRAME_SAMPLES
+        )
+        
+        logger.info("Audio stream started for wake word detection")
+        
+        window = _input_buffer[0, 0]
+        
+        while _is_listening:
+            try:
+                # Read audio frame and slide it into the bound input window
+                pcm = np.frombuffer(
+                    stream.read(FRAME_SAMPLES, exception_on_overflow=False), dtype=np.int16
+                )
+                window[:-FRAME_SAMPLES] = window[FRAME_SAMPLES:]
+                np.multiply(pcm, 1.0 / 32768.0, out=window[-FRAME_SAMPLES:], casting='unsafe')
+                
+                # Process frame
+                _session.run_with_iobinding(_binding)
+                scores = _binding.copy_outputs_to_cpu()[0].reshape(-1)
+                keyword_index = int(scores.argmax())
+                
+                if scores[keyword_index] >= _threshold:
+                    logger.info(f"Wake word detected: index {keyword_index}")
+                    
+                    if _wake_word_callback:
+                        try:
+                            _wake_word_callback(keyword_index)
+                        except Exception as e:
+                            logger.error(f"Error in wake word callback: {e}")
+                    
+                    # Start the next detection from silence so one utterance fires once
+                    window.fill(0.0)
+            
+            except Exception as e:
+                logger.error(f"Error in listen loop: {e}")
+                time.sleep(0.1)
+        
+        # Cleanup
+        stream.stop_stream()
+        stream.close()
+        audio.terminate()
+    
+    except ImportError:
+        logger.error("pyaudio not available for wake word detection")
+    except Exception as e:
+        logger.error(f"Listen loop failed: {e}")
+
+def cleanup():
+    """Cleanup ONNX Runtime resources."""
+    global _session, _binding, _input_buffer, _is_listening
+    
+    _is_listening = False
+    _session = None
+    _binding = None
+    _input_buffer = None
+    
+    logger.info("ONNX wake word model cleaned up")
+
+def quantize_model(model_fp32, model_int8):
+    """
+    Convert a float32 wake word model to int8 weights (one-time, offline).
+    
+    Args:
+        model_fp32 (str): Source .onnx model
+        model_int8 (str): Destination for the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    Path(model_int8).parent.mkdir(parents=True, exist_ok=True)
+    quantize_dynamic(model_fp32, model_int8, weight_type=QuantType.QInt8)
+    logger.info(f"Quantized wake word model saved to {model_int8}")
+
+def check_availability():
+    """Check if ONNX Runtime is available."""
+    try:
+        import onnxruntime
+        return True
+    except ImportError:
+        return False
+
+def get_info():
+    """Get plugin information."""
+    return {
+        "name": "ONNX Wake Word",
+        "description": "Wake word detection with an int8 ONNX model via ONNX Runtime",
+        "model": os.getenv('WAKEWORD_ONNX_MODEL', DEFAULT_MODEL),
+        "version": "1.0.0",
+        "requires": ["onnxruntime", "numpy", "pyaudio"],
+        "available": check_availability()
+    }
+
+if __name__ == "__main__":
+    # python -m plugins.wakeword_onnx model.onnx models/wakeword/wakeword_int8.onnx
+    if len(sys.argv) != 3:
+        print("Usage: python -m plugins.wakeword_onnx <model_fp32.onnx> <model_int8.onnx>")
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO)
+    quantize_model(sys.argv[1], sys.argv[2])
@@ -16,6 +16,10 @@ _audio_stream = None
 _is_listening = False
 _wake_word_callback = None
 
+# Owners of each live handle: being the active handle counts as one, and so
+# does each retain_handle() call; a handle is deleted when its count hits zero
+_handle_refs = {}
+
 def initialize(access_key=None, keywords=None, sensitivity=0.5):
     """
     Initialize Porcupine wake word detection.
@@ -24,9 +28,10 @@ def initialize(access_key=None, keywords=None, sensitivity=0.5):
         access_key (str): Picovoice access key
         keywords (list): List of wake words
         sensitivity (float): Detection sensitivity (0.0 to 1.0)
-    """
-    global _porcupine
     
+    Returns:
+        The Porcupine handle; call retain_handle() to keep it for use_handle()
+    """
     try:
         import pvporcupine
         
@@ -40,14 +45,14 @@ def initialize(access_key=None, keywords=None, sensitivity=0.5):
         
         logger.info(f"Initializing Porcupine with keywords: {keywords}")
         
-        _porcupine = pvporcupine.create(
+        _set_active(pvporcupine.create(
             access_key=access_key,
             keywords=keywords,
             sensitivities=[sensitivity] * len(keywords)
-        )
+        ))
         
         logger.info("Porcupine initialized successfully")
-        return True
+        return _porcupine
         
     except ImportError:
         raise ImportError("pvporcupine library not available. Install with: pip install pvporcupine")
@@ -55,6 +60,42 @@ def initialize(access_key=None, keywords=None, sensitivity=0.5):
         logger.error(f"Failed to initialize Porcupine: {e}")
         raise
 
+def _acquire(handle):
+    """Add an owner to a handle."""
+    _handle_refs[handle] = _handle_refs.get(handle, 0) + 1
+
+def _release(handle):
+    """Drop an owner from a handle, deleting it when none are left."""
+    count = _handle_refs.get(handle, 1) - 1
+    if count > 0:
+        _handle_refs[handle] = count
+    else:
+        _handle_refs.pop(handle, None)
+        handle.delete()
+
+def _set_active(handle):
+    """Replace the active handle, releasing the previous one."""
+    global _porcupine
+    previous = _porcupine
+    if handle is not None:
+        _acquire(handle)
+    _porcupine = handle
+    if previous is not None:
+        _release(previous)
+
+def retain_handle(handle):
+    """Keep a handle alive for later use_handle() calls until release_handle()."""
+    _acquire(handle)
+    return handle
+
+def use_handle(handle):
+    """Make a retained Porcupine handle the active one."""
+    _set_active(handle)
+
+def release_handle(handle):
+    """Drop a reference taken with retain_handle()."""
+    _release(handle)
+
 def start_listening(callback=None):
     """
     Start listening for wake words.
@@ -134,14 +175,11 @@ def _listen_loop():
         logger.error(f"Listen loop failed: {e}")
 
 def cleanup():
-    """Cleanup Porcupine resources."""
-    global _porcupine, _is_listening
+    """Cleanup Porcupine resources (handles still retained by a caller are kept)."""
+    global _is_listening
     
     _is_listening = False
-    
-    if _porcupine:
-        _porcupine.delete()
-        _porcupine = None
+    _set_active(None)
     
     logger.info("Porcupine cleaned up")
 
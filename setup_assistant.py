@@ -4,20 +4,61 @@ Voice Assistant Setup and Installation Script
 Comprehensive setup for the Lepida Voice Assistant
 """
 
+import atexit
+import functools
+import io
 import os
+import re
 import sys
 import subprocess
 import shutil
-import platform
+import socket
 import importlib
+import json
 from pathlib import Path
 from datetime import datetime
 import tempfile
-import requests
-import zipfile
 import logging
 import time
-import traceback
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Known subprocess failure patterns, checked in a single case-insensitive scan
+_ERROR_PATTERNS = re.compile(
+    r"(?P<perm>permission denied)"
+    r"|(?P<mod>no module named)"
+    r"|(?P<ext>externally-managed-environment)"
+    r"|(?P<net>network|connection)"
+    r"|(?P<disk>disk|space)",
+    re.IGNORECASE
+)
+
+# Solutions for the patterns above, in order of precedence
+_ERROR_SOLUTIONS = (
+    ("perm", "Try running as administrator/sudo, or check file permissions"),
+    ("mod", "Install missing dependencies: pip install -r requirements.txt"),
+    ("ext", "Use virtual environment: python -m venv .venv && activate it"),
+    ("net", "Check internet connection and try again"),
+    ("disk", "Free up disk space and try again"),
+)
+
+# Set once install_dependencies has installed frontend/requirements.txt as well
+_frontend_deps_installed = False
+
+ERROR_LOG_FILE = Path("logs") / "setup_error.log"
+ERROR_LOG_MAX_BYTES = 1 << 20  # rotate to setup_error.log.1 beyond 1 MB
+STEP_EVENTS_FILE = Path("logs") / "setup.jsonl"
+
+_capabilities = None  # populated by get_capabilities()
+_network_status = None  # populated by get_network_status()
+
+# Whether this interpreter runs inside a virtual environment (fixed for the process)
+IN_VENV = hasattr(sys, 'real_prefix') or getattr(sys, 'base_prefix', sys.prefix) != sys.prefix
+
+_error_fh = None  # opened lazily by _get_error_fh()
+_error_fh_lock = threading.RLock()  # concurrent steps may fail at the same time
 
 class SetupError(Exception):
     """Custom exception for setup-related errors."""
@@ -29,6 +70,7 @@ class SetupError(Exception):
 
 def setup_logging():
     """Setup comprehensive logging for the setup process."""
+    import platform
     # Create logs directory if it doesn't exist
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
@@ -47,6 +89,14 @@ def setup_logging():
         ]
     )
     
+    # Machine-readable step events (one JSON object per line) go to their
+    # own logger so they stay out of the human-readable log and console
+    events_logger = logging.getLogger('setup.events')
+    events_logger.propagate = False
+    events_handler = logging.FileHandler(STEP_EVENTS_FILE, encoding='utf-8')
+    events_handler.setFormatter(StepEventFormatter())
+    events_logger.addHandler(events_handler)
+    
     # Create a custom logger for setup
     logger = logging.getLogger('setup')
     logger.info("=" * 80)
@@ -62,6 +112,23 @@ def setup_logging():
     
     return logger
 
+class StepEventFormatter(logging.Formatter):
+    """Format setup step events as JSON lines."""
+    
+    def format(self, record):
+        return json.dumps({
+            "ts": datetime.fromtimestamp(record.created).isoformat(),
+            "step": getattr(record, "step", None),
+            "event": getattr(record, "event", None),
+            "duration_ms": getattr(record, "duration_ms", None),
+        }, ensure_ascii=False)
+
+def log_step_event(step_name, event, duration_ms=None):
+    """Record a structured step event (start/ok/fail/error/interrupted)."""
+    logging.getLogger('setup.events').info(
+        event, extra={"step": step_name, "event": event, "duration_ms": duration_ms}
+    )
+
 def log_step_start(step_name):
     """Log the start of a setup step."""
     logger = logging.getLogger('setup')
@@ -115,24 +182,60 @@ def handle_subprocess_error(e, operation="Operation"):
         print(f"❌ {error_msg}")
         print(f"   Error output: {stderr_output}")
         
-        # Provide specific solutions based on error patterns
-        if "permission denied" in stderr_output.lower():
-            solution = "Try running as administrator/sudo, or check file permissions"
-        elif "no module named" in stderr_output.lower():
-            solution = "Install missing dependencies: pip install -r requirements.txt"
-        elif "externally-managed-environment" in stderr_output.lower():
-            solution = "Use virtual environment: python -m venv .venv && activate it"
-        elif "network" in stderr_output.lower() or "connection" in stderr_output.lower():
-            solution = "Check internet connection and try again"
-        elif "disk" in stderr_output.lower() or "space" in stderr_output.lower():
-            solution = "Free up disk space and try again"
-        else:
-            solution = "Check the error details above and ensure all prerequisites are met"
+        # Provide specific solutions based on error patterns (single scan, first listed wins)
+        found = {m.lastgroup for m in _ERROR_PATTERNS.finditer(stderr_output)}
+        solution = next(
+            (text for group, text in _ERROR_SOLUTIONS if group in found),
+            "Check the error details above and ensure all prerequisites are met"
+        )
         
         print_error_with_solution("", solution, f"SUBPROCESS_{e.returncode}")
     else:
         print_error_with_solution(error_msg, "Check system requirements and try again", f"SUBPROCESS_{e.returncode}")
 
+@dataclass(frozen=True)
+class Capabilities:
+    """Host facts probed once per setup run and shared by the setup steps."""
+    python_version: tuple
+    os_name: str
+    os_release: str
+    machine: str
+    in_venv: bool
+    venv_present: bool
+    has_ffmpeg: bool
+
+def get_network_status():
+    """Return (pypi.org reachable, error message), probed on first use only.
+    
+    Kept out of Capabilities so steps that never need the network do not
+    wait on a connect timeout on offline hosts.
+    """
+    global _network_status
+    if _network_status is None:
+        # A TCP connect is enough, no TLS/HTTP needed
+        try:
+            socket.create_connection(("pypi.org", 443), timeout=3).close()
+            _network_status = (True, "")
+        except OSError as e:
+            _network_status = (False, str(e))
+    return _network_status
+
+def get_capabilities():
+    """Probe the host once and return the shared Capabilities instance."""
+    global _capabilities
+    if _capabilities is None:
+        import platform
+        _capabilities = Capabilities(
+            python_version=tuple(sys.version_info[:3]),
+            os_name=platform.system(),
+            os_release=platform.release(),
+            machine=platform.machine(),
+            in_venv=IN_VENV,
+            venv_present=os.path.isdir(".venv"),
+            has_ffmpeg=shutil.which("ffmpeg") is not None,
+        )
+    return _capabilities
+
 def check_prerequisites():
     """Check system prerequisites before starting setup."""
     logger = logging.getLogger('setup')
@@ -140,19 +243,20 @@ def check_prerequisites():
     print("🔍 Checking system prerequisites...")
     
     issues = []
+    caps = get_capabilities()
     
     # Check Python version
-    python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+    python_version = ".".join(str(part) for part in caps.python_version)
     logger.info(f"Python version: {python_version}")
     
-    if sys.version_info < (3, 8):
+    if caps.python_version < (3, 8):
         issues.append("Python 3.8+ is required")
         logger.error(f"Python version {python_version} is too old (minimum 3.8)")
     else:
         logger.info(f"Python version {python_version} is compatible")
     
     # Check if running as admin on Windows (for some operations)
-    if platform.system() == "Windows":
+    if caps.os_name == "Windows":
         try:
             import ctypes
             is_admin = ctypes.windll.shell32.IsUserAnAdmin()
@@ -177,14 +281,13 @@ def check_prerequisites():
         logger.warning(f"Could not check disk space: {e}")
     
     # Check internet connectivity
-    try:
-        import urllib.request
-        urllib.request.urlopen('https://pypi.org', timeout=5)
+    internet, network_error = get_network_status()
+    if internet:
         print("   ✅ Internet connection available")
         logger.info("Internet connection: Available")
-    except Exception as e:
+    else:
         print("   ⚠️  No internet connection - offline installation only")
-        log_step_warning("Prerequisites", f"No internet connection: {e}")
+        log_step_warning("Prerequisites", f"No internet connection: {network_error}")
     
     if issues:
         print("   ❌ Prerequisites check failed:")
@@ -226,8 +329,9 @@ def print_banner():
 
 def check_python_version():
     """Check if Python version is compatible."""
+    caps = get_capabilities()
     min_version = (3, 8)
-    current_version = sys.version_info[:2]
+    current_version = caps.python_version[:2]
     
     if current_version < min_version:
         print(f"❌ Python {min_version[0]}.{min_version[1]}+ is required")
@@ -235,22 +339,22 @@ def check_python_version():
         return False
     
     print(f"✅ Python {current_version[0]}.{current_version[1]} is compatible")
-    print(f"   Platform: {platform.system()} {platform.release()}")
-    print(f"   Architecture: {platform.machine()}")
+    print(f"   Platform: {caps.os_name} {caps.os_release}")
+    print(f"   Architecture: {caps.machine}")
     return True
 
 def setup_virtual_environment():
     """Create and setup virtual environment."""
     print("🐍 Setting up virtual environment...")
     
-    venv_path = Path(".venv")
+    caps = get_capabilities()
     
     # Check if virtual environment already exists
-    if venv_path.exists():
+    if caps.venv_present:
         print("   ✅ Virtual environment already exists")
         
         # Check if we're currently in the virtual environment
-        if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
+        if caps.in_venv:
             print("   ✅ Currently running in virtual environment")
             return True
         else:
@@ -262,27 +366,14 @@ def setup_virtual_environment():
         # Create virtual environment
         print("   Creating virtual environment...")
         
-        # Determine the correct Python executable
-        python_cmd = "python3" if platform.system() != "Windows" else "python"
-        
-        # Try python3 first, fallback to python
+        # Use the interpreter running this script so the venv matches its version
         try:
-            result = subprocess.run([python_cmd, "-m", "venv", ".venv"], 
-                                  check=True, capture_output=True, text=True, timeout=300)
+            subprocess.run([sys.executable, "-m", "venv", ".venv"],
+                           check=True, capture_output=True, text=True, timeout=300)
             print("   ✅ Virtual environment created successfully")
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            if python_cmd == "python3":
-                python_cmd = "python"
-                try:
-                    result = subprocess.run([python_cmd, "-m", "venv", ".venv"], 
-                                          check=True, capture_output=True, text=True, timeout=300)
-                    print("   ✅ Virtual environment created successfully")
-                except subprocess.CalledProcessError as e2:
-                    handle_subprocess_error(e2, "Virtual environment creation")
-                    return False
-            else:
-                handle_subprocess_error(e, "Virtual environment creation")
-                return False
+        except subprocess.CalledProcessError as e:
+            handle_subprocess_error(e, "Virtual environment creation")
+            return False
         except subprocess.TimeoutExpired:
             print_error_with_solution(
                 "Virtual environment creation timed out",
@@ -292,7 +383,7 @@ def setup_virtual_environment():
             return False
         
         # Provide activation instructions
-        if platform.system() == "Windows":
+        if caps.os_name == "Windows":
             activation_cmd = ".venv\\Scripts\\activate"
         else:
             activation_cmd = "source .venv/bin/activate"
@@ -332,9 +423,9 @@ def setup_virtual_environment():
         )
         return False
 
-def check_system_requirements():
+def check_system_requirements(out=None):
     """Check system requirements and available resources."""
-    print("🖥️  Checking system requirements...")
+    print("🖥️  Checking system requirements...", file=out)
     
     try:
         import psutil
@@ -342,35 +433,35 @@ def check_system_requirements():
         # Check available memory
         memory = psutil.virtual_memory()
         memory_gb = memory.total / (1024**3)
-        print(f"   RAM: {memory_gb:.1f} GB total, {memory.percent}% used")
+        print(f"   RAM: {memory_gb:.1f} GB total, {memory.percent}% used", file=out)
         
         if memory_gb < 2:
-            print("   ⚠️  Warning: Less than 2GB RAM available")
+            print("   ⚠️  Warning: Less than 2GB RAM available", file=out)
         
         # Check disk space
         disk = psutil.disk_usage('.')
         disk_free_gb = disk.free / (1024**3)
-        print(f"   Disk: {disk_free_gb:.1f} GB free")
+        print(f"   Disk: {disk_free_gb:.1f} GB free", file=out)
         
         if disk_free_gb < 1:
-            print("   ⚠️  Warning: Less than 1GB disk space available")
+            print("   ⚠️  Warning: Less than 1GB disk space available", file=out)
         
         # Check CPU
         cpu_count = psutil.cpu_count()
-        print(f"   CPU: {cpu_count} cores")
+        print(f"   CPU: {cpu_count} cores", file=out)
         
         return True
         
     except ImportError:
-        print("   ⚠️  psutil not installed - skipping detailed system check")
+        print("   ⚠️  psutil not installed - skipping detailed system check", file=out)
         return True
     except Exception as e:
-        print(f"   ⚠️  System check failed: {e}")
+        print(f"   ⚠️  System check failed: {e}", file=out)
         return True
 
-def check_audio_system():
+def check_audio_system(out=None):
     """Check audio system availability."""
-    print("🎵 Checking audio system...")
+    print("🎵 Checking audio system...", file=out)
     
     try:
         import pyaudio
@@ -388,27 +479,27 @@ def check_audio_system():
             if device_info['maxOutputChannels'] > 0:
                 output_devices.append(device_info['name'])
         
-        print(f"   Input devices: {len(input_devices)} found")
-        print(f"   Output devices: {len(output_devices)} found")
+        print(f"   Input devices: {len(input_devices)} found", file=out)
+        print(f"   Output devices: {len(output_devices)} found", file=out)
         
         if len(input_devices) == 0:
-            print("   ⚠️  No audio input devices found")
+            print("   ⚠️  No audio input devices found", file=out)
         if len(output_devices) == 0:
-            print("   ⚠️  No audio output devices found")
+            print("   ⚠️  No audio output devices found", file=out)
         
         audio.terminate()
         return True
         
     except ImportError:
-        print("   ⚠️  PyAudio not installed - audio system not available")
+        print("   ⚠️  PyAudio not installed - audio system not available", file=out)
         return False
     except Exception as e:
-        print(f"   ❌ Audio system check failed: {e}")
+        print(f"   ❌ Audio system check failed: {e}", file=out)
         return False
 
-def check_optional_dependencies():
+def check_optional_dependencies(out=None):
     """Check optional dependencies availability."""
-    print("🔍 Checking optional dependencies...")
+    print("🔍 Checking optional dependencies...", file=out)
     
     optional_deps = {
         'torch': 'PyTorch (for AI models)',
@@ -427,24 +518,24 @@ def check_optional_dependencies():
         try:
             importlib.import_module(dep)
             available.append(f"{dep} - {description}")
-            print(f"   ✅ {dep}")
+            print(f"   ✅ {dep}", file=out)
         except ImportError:
             missing.append(f"{dep} - {description}")
-            print(f"   ❌ {dep} (optional)")
+            print(f"   ❌ {dep} (optional)", file=out)
     
-    print(f"\n   Available: {len(available)}/{len(optional_deps)} optional dependencies")
+    print(f"\n   Available: {len(available)}/{len(optional_deps)} optional dependencies", file=out)
     
     if missing:
-        print("   Missing optional dependencies:")
+        print("   Missing optional dependencies:", file=out)
         for dep in missing:
-            print(f"     - {dep}")
-        print("   Note: These are optional and can be installed later if needed")
+            print(f"     - {dep}", file=out)
+        print("   Note: These are optional and can be installed later if needed", file=out)
     
     return True
 
-def download_models():
+def download_models(out=None):
     """Download required models if not present."""
-    print("📥 Checking and downloading models...")
+    print("📥 Checking and downloading models...", file=out)
     
     models_dir = Path("models")
     models_dir.mkdir(exist_ok=True)
@@ -457,18 +548,18 @@ def download_models():
     # Check for STT models
     whisper_model_path = models_dir / "whisper"
     if not whisper_model_path.exists():
-        print("   ⚠️  Whisper models not found")
-        print("   Models will be downloaded automatically when first used")
+        print("   ⚠️  Whisper models not found", file=out)
+        print("   Models will be downloaded automatically when first used", file=out)
     else:
-        print("   ✅ Whisper models directory exists")
+        print("   ✅ Whisper models directory exists", file=out)
     
     # Check for wake word models
     porcupine_model_path = models_dir / "porcupine"
     if not porcupine_model_path.exists():
-        print("   ⚠️  Porcupine wake word models not found")
-        print("   Wake word detection may require additional setup")
+        print("   ⚠️  Porcupine wake word models not found", file=out)
+        print("   Wake word detection may require additional setup", file=out)
     else:
-        print("   ✅ Porcupine models directory exists")
+        print("   ✅ Porcupine models directory exists", file=out)
     
     return True
 
@@ -481,16 +572,20 @@ def validate_configuration():
     if config_file.exists():
         try:
             import yaml
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            try:
+                from yaml import CSafeLoader as SafeLoader
+            except ImportError:
+                from yaml import SafeLoader
+            
+            # Let libyaml decode the raw bytes instead of going through the text wrapper
+            with open(config_file, 'rb') as f:
+                config = yaml.load(f, Loader=SafeLoader)
             
             required_sections = ['app', 'audio', 'tts', 'stt']
-            missing_sections = []
+            missing_sections = [section for section in required_sections if section not in config]
             
             for section in required_sections:
-                if section not in config:
-                    missing_sections.append(section)
-                else:
+                if section not in missing_sections:
                     print(f"   ✅ {section} section found")
             
             if missing_sections:
@@ -510,25 +605,68 @@ def validate_configuration():
 
 def create_directories():
     """Create necessary directories."""
-    directories = [
+    # Leaf directories only - parents (e.g. outputs/) are created along the way
+    directories = {
         "logs",
-        "outputs",
-        "outputs/sound", 
+        "outputs/sound",
         "models",
         "temp",
         "assets/audio"
-    ]
+    }
     
     print("📁 Creating directories...")
     for directory in directories:
-        path = Path(directory)
-        path.mkdir(parents=True, exist_ok=True)
-        print(f"   Created: {directory}")
+        os.makedirs(directory, exist_ok=True)
+    print(f"   Created {len(directories)} directories")
     
     return True
 
+def _run_pip_install(requirement_files, *extra_args, timeout=1800):
+    """Run pip install for the given requirement files, streaming its output.
+    
+    Returns the warning lines emitted by pip. Raises CalledProcessError with
+    the tail of the output on failure, or TimeoutExpired.
+    """
+    pip_cmd = [sys.executable, "-m", "pip", "install", "--progress-bar=off", *extra_args]
+    for requirement_file in requirement_files:
+        pip_cmd += ["-r", requirement_file]
+    
+    # Stream pip output so progress is visible and memory stays bounded;
+    # only the tail is kept for error diagnosis
+    proc = subprocess.Popen(pip_cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, bufsize=1)
+    warnings = []
+    output_tail = deque(maxlen=200)
+    
+    def read_output():
+        for line in proc.stdout:
+            output_tail.append(line)
+            if "WARNING" in line:
+                warnings.append(line)
+            elif line.startswith(("Collecting", "Installing")):
+                print(f"   {line.rstrip()}")
+    
+    # Output is read on a separate thread so the deadline applies even while
+    # pip is stalled without printing anything (e.g. a hung download)
+    reader = threading.Thread(target=read_output, name="pip-output", daemon=True)
+    reader.start()
+    try:
+        proc.wait(timeout=timeout)
+    except (subprocess.TimeoutExpired, KeyboardInterrupt):
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        reader.join(timeout=5)
+    
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, pip_cmd,
+                                            stderr="".join(output_tail))
+    return warnings
+
 def install_dependencies():
     """Install Python dependencies."""
+    global _frontend_deps_installed
     print("📦 Installing dependencies...")
     
     requirements_file = Path("requirements.txt")
@@ -542,22 +680,30 @@ def install_dependencies():
     
     try:
         # Check if we're in a virtual environment
-        in_venv = hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix)
-        if not in_venv and Path(".venv").exists():
+        if not IN_VENV and os.path.isdir(".venv"):
             print("   ⚠️  Virtual environment exists but not activated")
             print("   Consider activating it before installing dependencies")
         
         print("   Installing Python packages...")
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "--upgrade"
-        ], check=True, capture_output=True, text=True, timeout=1800)  # 30 minute timeout
+        frontend_requirements = Path("frontend") / "requirements.txt"
+        if frontend_requirements.exists():
+            # Resolve main and frontend requirements in one pip run; fall back
+            # to the main requirements alone if the combined set fails
+            try:
+                warnings = _run_pip_install(["requirements.txt", str(frontend_requirements)],
+                                            "--upgrade", "--prefer-binary")
+                _frontend_deps_installed = True
+            except subprocess.CalledProcessError:
+                print("   ⚠️  Combined install failed, retrying with requirements.txt only")
+                warnings = _run_pip_install(["requirements.txt"], "--upgrade")
+        else:
+            warnings = _run_pip_install(["requirements.txt"], "--upgrade")
         
         print("   ✅ Dependencies installed successfully")
         
         # Check for potential issues in pip output
-        if result.stderr and "WARNING" in result.stderr:
+        if warnings:
             print("   ⚠️  Some warnings occurred during installation:")
-            warnings = [line for line in result.stderr.split('\n') if 'WARNING' in line]
             for warning in warnings[:3]:  # Show first 3 warnings
                 print(f"     {warning.strip()}")
         
@@ -637,12 +783,15 @@ def setup_frontend():
         return False
     
     try:
-        # Install frontend dependencies
-        print("   Installing frontend dependencies...")
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", str(frontend_requirements)
-        ], check=True, capture_output=True, text=True, timeout=1800)
-        print("   ✅ Frontend dependencies installed")
+        # Install frontend dependencies, unless install_dependencies already did
+        if _frontend_deps_installed:
+            print("   ✅ Frontend dependencies already installed")
+        else:
+            print("   Installing frontend dependencies...")
+            subprocess.run([
+                sys.executable, "-m", "pip", "install", "-r", str(frontend_requirements)
+            ], check=True, capture_output=True, text=True, timeout=1800)
+            print("   ✅ Frontend dependencies installed")
         
         # Create frontend templates directory if not exists
         try:
@@ -824,6 +973,7 @@ def generate_audio_assets():
         print("   You can generate them manually by running:")
         print("   python assets/audio/generate_audio_assets.py")
         
+        import traceback
         log_step_error("Audio Assets Generation", str(e), traceback.format_exc())
         return True  # Don't fail setup for audio generation issues
 
@@ -837,37 +987,43 @@ def test_basic_functionality():
         config = get_config()
         print("   ✅ Configuration loading works")
         
-        # Test TTS initialization
-        try:
+        def init_tts():
             from utils.text_to_speech import TextToSpeech
-            tts = TextToSpeech(config)
-            print("   ✅ TTS system initialized")
-        except Exception as e:
-            print(f"   ⚠️  TTS initialization failed: {e}")
+            return TextToSpeech(config)
         
-        # Test audio processing
-        try:
+        def init_audio_processor():
             from helper.audio_processing import AudioProcessor
-            audio_processor = AudioProcessor(config)
-            print("   ✅ Audio processing initialized")
-        except Exception as e:
-            print(f"   ⚠️  Audio processing failed: {e}")
+            return AudioProcessor(config)
         
-        # Test wake word detection
-        try:
+        def init_wake_word():
             from utils.wake_word_detection import WakeWordDetector
-            wake_detector = WakeWordDetector(config)
-            print("   ✅ Wake word detection initialized")
-        except Exception as e:
-            print(f"   ⚠️  Wake word detection failed: {e}")
+            return WakeWordDetector(config)
         
-        # Test command processor
-        try:
+        def init_command_processor():
             from utils.command_processor import VoiceCommandProcessor
-            cmd_processor = VoiceCommandProcessor(config, None, None)
-            print("   ✅ Command processor initialized")
-        except Exception as e:
-            print(f"   ⚠️  Command processor failed: {e}")
+            return VoiceCommandProcessor(config, None, None)
+        
+        # (init function, success message, failure label)
+        subsystems = [
+            (init_tts, "TTS system initialized", "TTS initialization"),
+            (init_audio_processor, "Audio processing initialized", "Audio processing"),
+            (init_wake_word, "Wake word detection initialized", "Wake word detection"),
+            (init_command_processor, "Command processor initialized", "Command processor"),
+        ]
+        
+        # Subsystem inits are independent and mostly wait on model/device I/O,
+        # so run them concurrently; one failure does not block the others.
+        # Results are printed from this thread only, so lines never interleave.
+        with ThreadPoolExecutor(max_workers=len(subsystems)) as executor:
+            futures = {executor.submit(init_func): (ok_msg, fail_label)
+                       for init_func, ok_msg, fail_label in subsystems}
+            for future in as_completed(futures):
+                ok_msg, fail_label = futures[future]
+                try:
+                    future.result()
+                    print(f"   ✅ {ok_msg}")
+                except Exception as e:
+                    print(f"   ⚠️  {fail_label} failed: {e}")
         
         return True
         
@@ -888,25 +1044,25 @@ def validate_plugins():
         
         # Discover plugins
         plugins = validator.discover_plugins()
-        total_plugins = sum(len(plugin_list) for plugin_list in plugins.values())
+        total_plugins = 0
+        type_lines = []
+        for plugin_type, plugin_list in plugins.items():
+            count = len(plugin_list)
+            total_plugins += count
+            if count:
+                type_lines.append(f"     {plugin_type}: {count} plugins")
         
         print(f"   Found {total_plugins} plugins:")
-        for plugin_type, plugin_list in plugins.items():
-            if plugin_list:
-                print(f"     {plugin_type}: {len(plugin_list)} plugins")
+        for line in type_lines:
+            print(line)
         
         # Validate plugins
         if total_plugins > 0:
             results = validator.validate_all_plugins()
-            valid_count = 0
-            invalid_count = 0
-            
-            for plugin_type, plugin_results in results.items():
-                for plugin_name, result in plugin_results.items():
-                    if result.get("valid", False):
-                        valid_count += 1
-                    else:
-                        invalid_count += 1
+            checked_count = sum(len(plugin_results) for plugin_results in results.values())
+            valid_count = sum(1 for plugin_results in results.values()
+                              for result in plugin_results.values() if result.get("valid", False))
+            invalid_count = checked_count - valid_count
             
             print(f"   Validation: {valid_count} valid, {invalid_count} invalid")
             
@@ -930,7 +1086,8 @@ def run_health_check():
         
         config = get_config()
         checker = HealthChecker(config)
-        report = checker.run_all_checks()
+        # First boot: also construct the speech systems, not just probe them
+        report = checker.run_all_checks(deep=True)
         
         summary = report["summary"]
         if summary["error_count"] == 0:
@@ -945,265 +1102,413 @@ def run_health_check():
         print(f"❌ Health check failed: {e}")
         return False
 
-def setup_complete():
-    """Display setup completion message."""
-    print()
-    print("=" * 80)
-    print("🎉 SETUP COMPLETED SUCCESSFULLY! 🎉")
-    print("=" * 80)
-    print("""
+# --- Console text blocks ---
+# Multi-line output is pre-rendered once at import time and emitted with a
+# single write, instead of dozens of print() calls per block. The static
+# banners are stored pre-encoded so they can skip the text encoder.
+_RULE = "=" * 80
+
+BANNER_COMPLETE = (
+    f"\n{_RULE}\n"
+    "🎉 SETUP COMPLETED SUCCESSFULLY! 🎉\n"
+    f"{_RULE}\n"
+    """
     ░██████╗███████╗████████╗██╗░░░██╗██████╗░  ░█████╗░░█████╗░███╗░░░███╗██████╗░██╗░░░░░███████╗████████╗███████╗██████╗░
     ██╔════╝██╔════╝╚══██╔══╝██║░░░██║██╔══██╗  ██╔══██╗██╔══██╗████╗░████║██╔══██╗██║░░░░░██╔════╝╚══██╔══╝██╔════╝██╔══██╗
     ╚█████╗░█████╗░░░░░██║░░░██║░░░██║██████╔╝  ██║░░╚═╝██║░░██║██╔████╔██║██████╔╝██║░░░░░█████╗░░░░░██║░░░█████╗░░██║░░██║
     ░╚═══██╗██╔══╝░░░░░██║░░░██║░░░██║██╔═══╝░  ██║░░██╗██║░░██║██║╚██╔╝██║██╔═══╝░██║░░░░░██╔══╝░░░░░██║░░░██╔══╝░░██║░░██║
     ██████╔╝███████╗░░░██║░░░╚██████╔╝██║░░░░░  ╚█████╔╝╚█████╔╝██║░╚═╝░██║██║░░░░░███████╗███████╗░░░██║░░░███████╗██████╔╝
     ╚═════╝░╚══════╝░░░╚═╝░░░░╚════╝░╚═╝░░░░░  ░╚════╝░░╚════╝░╚═╝░░░░░╚═╝╚═╝░░░░░╚══════╝╚══════╝░░░╚═╝░░░╚══════╝╚═════╝░
-    """)
-    print()
+    \n"""
+    "\n"
+).encode("utf-8")
+
+NEXT_STEPS = f"""🚀 Next steps:
+1. Run health check: python cli.py health
+2. Test TTS: python cli.py test-tts
+3. Test STT: python cli.py test-stt
+4. List audio devices: python cli.py devices
+5. Start voice assistant: python cli.py run
+6. Start web interface: cd frontend && python app.py
+
+🎯 Alternative launch methods:
+- Simple launcher: python launcher.py
+- Direct app: python app.py
+- Web interface: http://localhost:5000 (after starting frontend)
+
+⚙️  Configuration files:
+- Edit config.yml for voice assistant settings
+- Edit .env for API keys and environment variables
+
+🔧 Troubleshooting:
+- For detailed system report: python cli.py health
+- For plugin validation: python -c \"from utils.plugin_validator import *\"
+- Check logs in: logs/voice_assistant.log
+{_RULE}
+"""
+
+BANNER_RECOVERY = (
+    f"{_RULE}\n"
+    """
+    ██████╗░███████╗░█████╗░░█████╗░██╗░░░██╗███████╗██████╗░██╗░░░██╗  ███╗░░░███╗░█████╗░██████╗░███████╗
+    ██╔══██╗██╔════╝██╔══██╗██╔══██╗██║░░░██║██╔════╝██╔══██╗╚██╗░██╔╝  ████╗░████║██╔══██╗██╔══██╗██╔════╝
+    ██████╔╝█████╗░░██║░░╚═╝██║░░██║╚██╗░██╔╝█████╗░░██████╔╝░╚████╔╝░  ██╔████╔██║██║░░██║██║░░██║█████╗░░
+    ██╔══██╗██╔══╝░░██║░░██╗██║░░██║░╚████╔╝░██╔══╝░░██╔══██╗░░╚██╔╝░░  ██║╚██╔╝██║██║░░██║██║░░██║██╔══╝░░
+    ██║░░██║███████╗╚█████╔╝╚█████╔╝░░╚██╔╝░░███████╗██║░░██║░░░██║░░░  ██║░╚═╝░██║╚█████╔╝██████╔╝███████╗
+    ╚═╝░░╚═╝╚══════╝░╚════╝░░╚════╝░░░░╚═╝░░░╚══════╝╚═╝░░╚═╝░░░╚═╝░░░  ╚═╝░░░░░╚═╝░╚════╝░╚═════╝░╚══════╝
+    \n"""
+    "🔧 RECOVERY MODE - Fixing Common Issues\n"
+    f"{_RULE}\n"
+    "This mode will attempt to fix common issues\n"
+    "\n"
+).encode("utf-8")
+
+BANNER_QUICK = (
+    f"{_RULE}\n"
+    """
+    ░██████╗░██╗░░░██╗██╗░█████╗░██╗░░██╗  ░██████╗███████╗████████╗██╗░░░██╗██████╗░
+    ██╔═══██╗██║░░░██║██║██╔══██╗██║░██╔╝  ██╔════╝██╔════╝╚══██╔══╝██║░░░██║██╔══██╗
+    ██║██╗██║██║░░░██║██║██║░░╚═╝█████═╝░  ╚█████╗░█████╗░░░░░██║░░░██║░░░██║██████╔╝
+    ╚██████╔╝██║░░░██║██║██║░░██╗██╔═██╗░  ░╚═══██╗██╔══╝░░░░░██║░░░██║░░░██║██╔═══╝░
+    ░╚═██╔═╝░╚██████╔╝██║╚█████╔╝██║░╚██╗  ██████╔╝███████╗░░░██║░░░╚██████╔╝██║░░░░░
+    ░░░╚═╝░░░░╚═════╝░╚═╝░╚════╝░╚═╝░░╚═╝  ╚═════╝░╚══════╝░░░╚═╝░░░░╚═════╝░╚═╝░░░░░
+            \n"""
+    "🚀 QUICK SETUP MODE - Essential Components Only\n"
+    f"{_RULE}\n"
+).encode("utf-8")
+
+BANNER_FRONTEND = (
+    f"{_RULE}\n"
+    """
+    ███████╗██████╗░░█████╗░███╗░░██╗████████╗███████╗███╗░░██╗██████╗░  ░██████╗███████╗████████╗██╗░░░██╗██████╗░
+    ██╔════╝██╔══██╗██╔══██╗████╗░██║╚══██╔══╝██╔════╝████╗░██║██╔══██╗  ██╔════╝██╔════╝╚══██╔══╝██║░░░██║██╔══██╗
+    █████╗░░██████╔╝██║░░██║██╔██╗██║░░░██║░░░█████╗░░██╔██╗██║██║░░██║  ╚█████╗░█████╗░░░░██║░░░██║░░░██║██████╔╝
+    ██╔══╝░░██╔══██╗██║░░██║██║╚████║░░░██║░░░██╔══╝░░██║╚████║██║░░██║  ░╚═══██╗██╔══╝░░░░██║░░░██║░░░██║██╔═══╝░
+    ██║░░░░░██║░░██║╚█████╔╝██║░╚███║░░░██║░░░███████╗██║░╚███║██████╔╝  ██████╔╝███████╗░░░██║░░░╚██████╔╝██║░░░░░
+    ╚═╝░░░░░╚═╝░░╚═╝░╚════╝░╚═╝░░╚══╝░░░╚═╝░░░╚══════╝╚═╝░░╚══╝╚═════╝░  ╚═════╝░╚══════╝░░░╚═╝░░░░╚═════╝░╚═════╝░
+            \n"""
+    "🌐 FRONTEND SETUP MODE - Web Interface Configuration\n"
+    f"{_RULE}\n"
+).encode("utf-8")
+
+HELP_TEXT = """Voice Assistant Setup Options:
+  python setup_assistant.py          # Full setup (includes virtual environment)
+  python setup_assistant.py --quick  # Quick setup (no dependencies, includes venv)
+  python setup_assistant.py --frontend # Setup frontend only (includes venv)
+  python setup_assistant.py --recovery # Fix common issues
+  python setup_assistant.py --help   # Show this help
+
+Virtual Environment:
+  The setup will create a .venv folder with isolated Python packages.
+  After setup, activate it with:
+    {activate_cmd}
+
+Error Handling:
+  • All errors are logged to logs/setup_error.log
+  • Use --recovery mode to fix common issues
+  • Check troubleshooting guide after failed setup
+"""
+
+# Troubleshooting tag for each setup step that has a dedicated section below
+STEP_TAG = {
+    "Setting up virtual environment": "venv",
+    "Installing dependencies": "deps",
+    "Checking optional dependencies": "deps",
+    "Setting up frontend": "frontend",
+    "Checking audio system": "audio",
+    "Generating audio assets": "audio",
+}
+
+# Troubleshooting sections for print_setup_summary, keyed by step tag
+TROUBLESHOOTING_SECTIONS = (
+    ("venv", """🐍 Virtual Environment Issues:
+   • Try: python -m venv .venv
+   • Or: python3 -m venv .venv
+   • Check Python installation and permissions
+"""),
+    ("deps", """📦 Dependency Issues:
+   • Activate virtual environment first
+   • Try: pip install --upgrade pip
+   • Check internet connection
+   • Manual install: pip install -r requirements.txt
+"""),
+    ("frontend", """🌐 Frontend Issues:
+   • Check frontend/ directory exists
+   • Verify frontend/requirements.txt
+   • Try: cd frontend && pip install -r requirements.txt
+"""),
+    ("audio", """🎵 Audio System Issues:
+   • Install audio drivers
+   • Check microphone/speaker connections
+   • May work without audio for text-only mode
+"""),
+)
+
+RECOVERY_OPTIONS = """🆘 RECOVERY OPTIONS:
+   1. Run recovery mode: python setup_assistant.py --recovery
+   2. Manual setup: Follow README.md instructions
+   3. Quick setup: python setup_assistant.py --quick
+   4. Check logs in: logs/setup_error.log"""
+
+def write_block(block):
+    """Write a pre-rendered text block to stdout in a single call.
+    
+    UTF-8 bytes are written straight to the binary buffer when stdout is a
+    UTF-8 stream; otherwise they are decoded and written as text.
+    """
+    if isinstance(block, bytes):
+        buffer = getattr(sys.stdout, "buffer", None)
+        encoding = (getattr(sys.stdout, "encoding", None) or "").lower().replace("-", "")
+        if buffer is not None and encoding == "utf8":
+            sys.stdout.flush()  # keep ordering with text already written
+            buffer.write(block)
+            buffer.flush()
+            return
+        block = block.decode("utf-8")
+    sys.stdout.write(block)
+    sys.stdout.flush()
+
+def setup_complete():
+    """Display setup completion message."""
+    write_block(BANNER_COMPLETE)
+    lines = []
     
     # Check if we're in virtual environment
-    in_venv = hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix)
-    venv_exists = Path(".venv").exists()
+    caps = get_capabilities()
+    venv_exists = os.path.isdir(".venv")
     
-    if venv_exists and not in_venv:
-        print("⚠️  IMPORTANT: Activate your virtual environment first!")
-        if platform.system() == "Windows":
-            print("   Command: .venv\\Scripts\\activate")
+    if venv_exists and not IN_VENV:
+        lines.append("⚠️  IMPORTANT: Activate your virtual environment first!\n")
+        if caps.os_name == "Windows":
+            lines.append("   Command: .venv\\Scripts\\activate\n\n")
         else:
-            print("   Command: source .venv/bin/activate")
-        print()
-    
-    print("🚀 Next steps:")
-    print("1. Run health check: python cli.py health")
-    print("2. Test TTS: python cli.py test-tts")
-    print("3. Test STT: python cli.py test-stt")
-    print("4. List audio devices: python cli.py devices")
-    print("5. Start voice assistant: python cli.py run")
-    print("6. Start web interface: cd frontend && python app.py")
-    print()
-    print("🎯 Alternative launch methods:")
-    print("- Simple launcher: python launcher.py")
-    print("- Direct app: python app.py")
-    print("- Web interface: http://localhost:5000 (after starting frontend)")
-    print()
-    print("⚙️  Configuration files:")
-    print("- Edit config.yml for voice assistant settings")
-    print("- Edit .env for API keys and environment variables")
-    print()
-    print("🔧 Troubleshooting:")
-    print("- For detailed system report: python cli.py health")
-    print("- For plugin validation: python -c \"from utils.plugin_validator import *\"")
-    print("- Check logs in: logs/voice_assistant.log")
-    print("=" * 80)
+            lines.append("   Command: source .venv/bin/activate\n\n")
+    
+    lines.append(NEXT_STEPS)
+    write_block("".join(lines))
 
-def print_setup_summary(failed_steps, error_log):
-    """Print a comprehensive setup summary with troubleshooting info."""
-    print("\n" + "=" * 80)
+def print_setup_summary(failed_steps, error_log, failed_tags=None):
+    """Print a comprehensive setup summary with troubleshooting info.
+    
+    failed_tags is the set of STEP_TAG values for the failed steps; it is
+    derived from failed_steps when not given.
+    """
+    lines = ["", _RULE]
     if failed_steps:
-        print("⚠️  SETUP COMPLETED WITH ISSUES")
-        print("=" * 80)
-        print(f"📊 Summary: {len(failed_steps)} step(s) failed")
-        print("\n🔴 Failed Steps:")
+        lines.append("⚠️  SETUP COMPLETED WITH ISSUES")
+        lines.append(_RULE)
+        lines.append(f"📊 Summary: {len(failed_steps)} step(s) failed")
+        lines.append("\n🔴 Failed Steps:")
         for i, step in enumerate(failed_steps, 1):
-            print(f"   {i}. {step}")
+            lines.append(f"   {i}. {step}")
         
-        print("\n🔧 TROUBLESHOOTING GUIDE:")
-        print("=" * 40)
+        lines.append("\n🔧 TROUBLESHOOTING GUIDE:")
+        lines.append("=" * 40)
         
         # Specific troubleshooting based on failed steps
-        if any("virtual environment" in step.lower() for step in failed_steps):
-            print("🐍 Virtual Environment Issues:")
-            print("   • Try: python -m venv .venv")
-            print("   • Or: python3 -m venv .venv")
-            print("   • Check Python installation and permissions")
-            print()
-        
-        if any("dependencies" in step.lower() for step in failed_steps):
-            print("📦 Dependency Issues:")
-            print("   • Activate virtual environment first")
-            print("   • Try: pip install --upgrade pip")
-            print("   • Check internet connection")
-            print("   • Manual install: pip install -r requirements.txt")
-            print()
-        
-        if any("frontend" in step.lower() for step in failed_steps):
-            print("🌐 Frontend Issues:")
-            print("   • Check frontend/ directory exists")
-            print("   • Verify frontend/requirements.txt")
-            print("   • Try: cd frontend && pip install -r requirements.txt")
-            print()
-        
-        if any("audio" in step.lower() for step in failed_steps):
-            print("🎵 Audio System Issues:")
-            print("   • Install audio drivers")
-            print("   • Check microphone/speaker connections")
-            print("   • May work without audio for text-only mode")
-            print()
-        
-        print("🆘 RECOVERY OPTIONS:")
-        print("   1. Run recovery mode: python setup_assistant.py --recovery")
-        print("   2. Manual setup: Follow README.md instructions")
-        print("   3. Quick setup: python setup_assistant.py --quick")
-        print("   4. Check logs in: logs/setup_error.log")
+        if failed_tags is None:
+            failed_tags = {STEP_TAG[step] for step in failed_steps if step in STEP_TAG}
+        
+        for tag, section in TROUBLESHOOTING_SECTIONS:
+            if tag in failed_tags:
+                lines.append(section)
+        
+        lines.append(RECOVERY_OPTIONS)
         
     else:
-        print("🎉 SETUP COMPLETED SUCCESSFULLY!")
-        print("=" * 80)
-        print("✅ All components installed and configured correctly")
+        lines.append("🎉 SETUP COMPLETED SUCCESSFULLY!")
+        lines.append(_RULE)
+        lines.append("✅ All components installed and configured correctly")
     
-    print("=" * 80)
+    lines.append(_RULE)
+    write_block("\n".join(lines) + "\n")
+
+def _rotate_error_log():
+    """Move an oversized error log aside to setup_error.log.1 (replacing any older one)."""
+    global _error_fh
+    if _error_fh is not None:
+        _error_fh.close()
+        atexit.unregister(_error_fh.close)
+        _error_fh = None
+    os.replace(ERROR_LOG_FILE, ERROR_LOG_FILE.with_name(ERROR_LOG_FILE.name + ".1"))
 
-def log_error_to_file(error_info):
-    """Log error information to a file for debugging."""
+def _get_error_fh():
+    """Open logs/setup_error.log on first use and keep it open for the session."""
+    global _error_fh
+    with _error_fh_lock:
+        if _error_fh is None:
+            ERROR_LOG_FILE.parent.mkdir(exist_ok=True)
+            try:
+                if os.stat(ERROR_LOG_FILE).st_size > ERROR_LOG_MAX_BYTES:
+                    _rotate_error_log()
+            except FileNotFoundError:
+                pass
+            _error_fh = open(ERROR_LOG_FILE, "a", encoding="utf-8", buffering=1 << 16)
+            atexit.register(_error_fh.close)
+        return _error_fh
+
+def log_error_to_file(error_info, out=None):
+    """Log error information to a file for debugging (console notes go to out)."""
     logger = logging.getLogger('setup')
     try:
-        logs_dir = Path("logs")
-        logs_dir.mkdir(exist_ok=True)
-        
-        error_log_file = logs_dir / "setup_error.log"
-        
-        with open(error_log_file, "a", encoding="utf-8") as f:
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"\n{'='*50}\n")
-            f.write(f"Timestamp: {timestamp}\n")
-            f.write(f"Error: {error_info.get('error', 'Unknown')}\n")
-            f.write(f"Step: {error_info.get('step', 'Unknown')}\n")
-            if 'traceback' in error_info:
-                f.write(f"Traceback:\n{error_info['traceback']}\n")
-            f.write(f"{'='*50}\n")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        entry = (
+            f"\n{'='*50}\n"
+            f"Timestamp: {timestamp}\n"
+            f"Error: {error_info.get('error', 'Unknown')}\n"
+            f"Step: {error_info.get('step', 'Unknown')}\n"
+        )
+        if error_info.get('traceback'):
+            entry += f"Traceback:\n{error_info['traceback']}\n"
+        entry += f"{'='*50}\n"
+        
+        # Entries from steps failing together must not interleave or race the rotation
+        with _error_fh_lock:
+            fh = _get_error_fh()
+            fh.write(entry)
+            fh.flush()
+            if fh.tell() > ERROR_LOG_MAX_BYTES:
+                _rotate_error_log()
             
-        print(f"   📝 Error logged to: {error_log_file}")
-        logger.info(f"Error details logged to: {error_log_file}")
+        print(f"   📝 Error logged to: {ERROR_LOG_FILE}", file=out)
+        logger.info(f"Error details logged to: {ERROR_LOG_FILE}")
     except Exception as e:
-        print(f"   ⚠️  Could not log error: {e}")
+        print(f"   ⚠️  Could not log error: {e}", file=out)
         logger.warning(f"Could not log error to file: {e}")
 
-def safe_step_execution(step_name, step_func):
-    """Safely execute a setup step with comprehensive error handling."""
+def safe_step_execution(step_name, step_func, capture_tb=True, out=None):
+    """Safely execute a setup step with comprehensive error handling.
+    
+    With capture_tb=False, exceptions are reported without formatting a
+    traceback (used by quick setup, where failures are non-critical).
+    Console messages go to out (default: sys.stdout).
+    """
     logger = logging.getLogger('setup')
     
+    start_time = time.perf_counter()
+    
+    # Console lines for this step, formatted once and shared by all branches
+    start_msg = f"\n🔄 {step_name}..."
+    ok_msg = f"   ✅ {step_name} completed successfully"
+    fail_msg = f"   ❌ {step_name} failed"
+    
+    def elapsed_ms():
+        return round((time.perf_counter() - start_time) * 1000, 1)
+    
     try:
         log_step_start(step_name)
-        print(f"\n🔄 {step_name}...")
+        log_step_event(step_name, "start")
+        print(start_msg, file=out)
         
-        start_time = time.time()
         result = step_func()
-        end_time = time.time()
-        execution_time = end_time - start_time
+        execution_time = time.perf_counter() - start_time
         
         if result:
-            print(f"   ✅ {step_name} completed successfully")
+            print(ok_msg, file=out)
             log_step_success(f"{step_name} (executed in {execution_time:.2f}s)")
+            log_step_event(step_name, "ok", elapsed_ms())
         else:
-            print(f"   ❌ {step_name} failed")
+            print(fail_msg, file=out)
             log_step_error(step_name, "Step function returned False")
+            log_step_event(step_name, "fail", elapsed_ms())
         
         return result
         
     except KeyboardInterrupt:
-        print(f"\n   ⏹️  {step_name} interrupted by user")
-        print("   Setup cancelled. You can resume by running setup again.")
+        print(f"\n   ⏹️  {step_name} interrupted by user", file=out)
+        print("   Setup cancelled. You can resume by running setup again.", file=out)
         log_step_error(step_name, "Interrupted by user")
+        log_step_event(step_name, "interrupted", elapsed_ms())
         return False
         
     except Exception as e:
+        log_step_event(step_name, "error", elapsed_ms())
+        tb = None
+        if capture_tb:
+            import traceback
+            tb = traceback.format_exc()
         error_info = {
             'error': str(e),
             'step': step_name,
-            'traceback': traceback.format_exc()
+            'traceback': tb
         }
-        print(f"   ❌ {step_name} failed with exception: {e}")
-        log_step_error(step_name, str(e), traceback.format_exc())
-        log_error_to_file(error_info)
+        print(f"{fail_msg} with exception: {e}", file=out)
+        log_step_error(step_name, str(e), tb)
+        log_error_to_file(error_info, out=out)
         
         # Provide step-specific recovery suggestions
         if "virtual environment" in step_name.lower():
-            print("   💡 Try manually: python -m venv .venv")
+            print("   💡 Try manually: python -m venv .venv", file=out)
             logger.info("   Recovery suggestion: python -m venv .venv")
         elif "dependencies" in step_name.lower():
-            print("   💡 Try manually: pip install -r requirements.txt")
+            print("   💡 Try manually: pip install -r requirements.txt", file=out)
             logger.info("   Recovery suggestion: pip install -r requirements.txt")
         elif "frontend" in step_name.lower():
-            print("   💡 Try: python setup_assistant.py --frontend")
+            print("   💡 Try: python setup_assistant.py --frontend", file=out)
             logger.info("   Recovery suggestion: python setup_assistant.py --frontend")
         
         return False
 
+def run_steps_concurrently(steps, max_workers=4):
+    """Run independent setup steps in a thread pool.
+    
+    Every step function must accept an out= stream and print only to it.
+    Each step writes to its own buffer, printed as one block when the step
+    finishes, so output from different steps never interleaves.
+    Returns the names of failed steps in declaration order.
+    """
+    output_lock = threading.Lock()
+    
+    def run_step(step_name, step_func):
+        out = io.StringIO()
+        try:
+            return safe_step_execution(step_name, functools.partial(step_func, out=out), out=out)
+        finally:
+            with output_lock:
+                sys.stdout.write(out.getvalue())
+                sys.stdout.flush()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_step, step_name, step_func): step_name
+                   for step_name, step_func in steps}
+        results = {futures[future]: future.result() for future in as_completed(futures)}
+    
+    return [step_name for step_name, _ in steps if not results[step_name]]
+
+# Steps run by recovery_mode (prerequisites check is optionally prepended)
+RECOVERY_STEPS = (
+    ("Recreating directories", create_directories),
+    ("Regenerating .env file", setup_environment),
+    ("Regenerating audio assets", generate_audio_assets),
+    ("Testing configuration", validate_configuration),
+)
+
 def recovery_mode():
     """Run setup in recovery mode for fixing issues."""
-    print("=" * 80)
-    print("""
-    ██████╗░███████╗░█████╗░░█████╗░██╗░░░██╗███████╗██████╗░██╗░░░██╗  ███╗░░░███╗░█████╗░██████╗░███████╗
-    ██╔══██╗██╔════╝██╔══██╗██╔══██╗██║░░░██║██╔════╝██╔══██╗╚██╗░██╔╝  ████╗░████║██╔══██╗██╔══██╗██╔════╝
-    ██████╔╝█████╗░░██║░░╚═╝██║░░██║╚██╗░██╔╝█████╗░░██████╔╝░╚████╔╝░  ██╔████╔██║██║░░██║██║░░██║█████╗░░
-    ██╔══██╗██╔══╝░░██║░░██╗██║░░██║░╚████╔╝░██╔══╝░░██╔══██╗░░╚██╔╝░░  ██║╚██╔╝██║██║░░██║██║░░██║██╔══╝░░
-    ██║░░██║███████╗╚█████╔╝╚█████╔╝░░╚██╔╝░░███████╗██║░░██║░░░██║░░░  ██║░╚═╝░██║╚█████╔╝██████╔╝███████╗
-    ╚═╝░░╚═╝╚══════╝░╚════╝░░╚════╝░░░░╚═╝░░░╚══════╝╚═╝░░╚═╝░░░╚═╝░░░  ╚═╝░░░░░╚═╝░╚════╝░╚═════╝░╚══════╝
-    """)
-    print("🔧 RECOVERY MODE - Fixing Common Issues")
-    print("=" * 80)
-    print("This mode will attempt to fix common issues")
-    print()
-    
-    recovery_steps = [
-        ("Checking prerequisites", check_prerequisites),
-        ("Recreating directories", create_directories),
-        ("Regenerating .env file", setup_environment),
-        ("Regenerating audio assets", generate_audio_assets),
-        ("Testing configuration", validate_configuration),
-    ]
+    write_block(BANNER_RECOVERY)
     
     failed_recovery_steps = []
     
-    for step_name, step_func in recovery_steps:
+    for step_name, step_func in (("Checking prerequisites", check_prerequisites),) + RECOVERY_STEPS:
         if not safe_step_execution(step_name, step_func):
             failed_recovery_steps.append(step_name)
     
-    print("\n" + "=" * 80)
+    lines = ["", _RULE]
     if failed_recovery_steps:
-        print("⚠️  Recovery completed with some issues")
-        print(f"Failed recovery steps: {', '.join(failed_recovery_steps)}")
-        print("\n💡 Manual recovery suggestions:")
-        print("   1. Check file permissions")
-        print("   2. Ensure you're in the correct directory")
-        print("   3. Try running as administrator")
-        print("   4. Check disk space and internet connection")
+        lines.append("⚠️  Recovery completed with some issues")
+        lines.append(f"Failed recovery steps: {', '.join(failed_recovery_steps)}")
+        lines.append("\n💡 Manual recovery suggestions:")
+        lines.append("   1. Check file permissions")
+        lines.append("   2. Ensure you're in the correct directory")
+        lines.append("   3. Try running as administrator")
+        lines.append("   4. Check disk space and internet connection")
     else:
-        print("✅ Recovery mode completed successfully")
-    
-    print("\nNext step: Try running the full setup again:")
-    print("   python setup_assistant.py")
-    print("=" * 80)
-    print("=" * 80)
-    print("""
-    ██████╗░███████╗░█████╗░░█████╗░██╗░░░██╗███████╗██████╗░██╗░░░██╗  ███╗░░░███╗░█████╗░██████╗░███████╗
-    ██╔══██╗██╔════╝██╔══██╗██╔══██╗██║░░░██║██╔════╝██╔══██╗╚██╗░██╔╝  ████╗░████║██╔══██╗██╔══██╗██╔════╝
-    ██████╔╝█████╗░░██║░░╚═╝██║░░██║╚██╗░██╔╝█████╗░░██████╔╝░╚████╔╝░  ██╔████╔██║██║░░██║██║░░██║█████╗░░
-    ██╔══██╗██╔══╝░░██║░░██╗██║░░██║░╚████╔╝░██╔══╝░░██╔══██╗░░╚██╔╝░░  ██║╚██╔╝██║██║░░██║██║░░██║██╔══╝░░
-    ██║░░██║███████╗╚█████╔╝╚█████╔╝░░╚██╔╝░░███████╗██║░░██║░░░██║░░░  ██║░╚═╝░██║╚█████╔╝██████╔╝███████╗
-    ╚═╝░░╚═╝╚══════╝░╚════╝░░╚════╝░░░░╚═╝░░░╚══════╝╚═╝░░╚═╝░░░╚═╝░░░  ╚═╝░░░░░╚═╝░╚════╝░╚═════╝░╚══════╝
-    """)
-    print("🔧 RECOVERY MODE - Fixing Common Issues")
-    print("=" * 80)
-    print("This mode will attempt to fix common issues")
-    print()
-    
-    recovery_steps = [
-        ("Recreating directories", create_directories),
-        ("Regenerating .env file", setup_environment),
-        ("Regenerating audio assets", generate_audio_assets),
-        ("Testing configuration", validate_configuration),
-    ]
-    
-    for step_name, step_func in recovery_steps:
-        print(f"🔄 {step_name}...")
-        try:
-            step_func()
-        except Exception as e:
-            print(f"❌ {step_name} failed: {e}")
+        lines.append("✅ Recovery mode completed successfully")
     
-    print("\n✅ Recovery mode completed")
-    print("Try running the full setup again: python setup_assistant.py")
+    lines.append("\nNext step: Try running the full setup again:")
+    lines.append("   python setup_assistant.py")
+    lines.append(_RULE)
+    write_block("\n".join(lines) + "\n")
 
 # --- FFMPEG SETUP STEP ---
 def setup_ffmpeg():
@@ -1211,13 +1516,13 @@ def setup_ffmpeg():
     print("🔎 Checking ffmpeg installation...")
     import shutil
     ffmpeg_bin_path = os.path.abspath(os.path.join("bin", "ffmpeg", "ffmpeg.exe"))
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path or os.path.isfile(ffmpeg_bin_path):
-        found_path = ffmpeg_path if ffmpeg_path else ffmpeg_bin_path
+    caps = get_capabilities()
+    if caps.has_ffmpeg or os.path.isfile(ffmpeg_bin_path):
+        found_path = shutil.which("ffmpeg") if caps.has_ffmpeg else ffmpeg_bin_path
         print(f"   ✅ ffmpeg found: {found_path}")
         return True
-    system = platform.system()
-    arch = platform.machine().lower()
+    system = caps.os_name
+    arch = caps.machine.lower()
     # Use n7.1-latest release pattern
     ffmpeg_base_url = "https://github.com/BtbN/FFmpeg-Builds/releases/latest/download/"
     ffmpeg_filename = None
@@ -1231,6 +1536,8 @@ def setup_ffmpeg():
             ffmpeg_filename = "ffmpeg-n7.1-latest-win32-lgpl-shared-7.1.zip"
         ffmpeg_url = ffmpeg_base_url + ffmpeg_filename
         try:
+            import requests
+            import zipfile
             print(f"   Downloading ffmpeg from: {ffmpeg_url}")
             temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix=".zip")
             with requests.get(ffmpeg_url, stream=True) as r:
@@ -1335,17 +1642,7 @@ def main():
             return
         elif sys.argv[1] == "--quick":
             logger.info("Starting quick setup mode")
-            print("=" * 80)
-            print("""
-    ░██████╗░██╗░░░██╗██╗░█████╗░██╗░░██╗  ░██████╗███████╗████████╗██╗░░░██╗██████╗░
-    ██╔═══██╗██║░░░██║██║██╔══██╗██║░██╔╝  ██╔════╝██╔════╝╚══██╔══╝██║░░░██║██╔══██╗
-    ██║██╗██║██║░░░██║██║██║░░╚═╝█████═╝░  ╚█████╗░█████╗░░░░░██║░░░██║░░░██║██████╔╝
-    ╚██████╔╝██║░░░██║██║██║░░██╗██╔═██╗░  ░╚═══██╗██╔══╝░░░░░██║░░░██║░░░██║██╔═══╝░
-    ░╚═██╔═╝░╚██████╔╝██║╚█████╔╝██║░╚██╗  ██████╔╝███████╗░░░██║░░░╚██████╔╝██║░░░░░
-    ░░░╚═╝░░░░╚═════╝░╚═╝░╚════╝░╚═╝░░╚═╝  ╚═════╝░╚══════╝░░░╚═╝░░░░╚═════╝░╚═╝░░░░░
-            """)
-            print("🚀 QUICK SETUP MODE - Essential Components Only")
-            print("=" * 80)
+            write_block(BANNER_QUICK)
             quick_steps = [
                 ("Checking Python version", check_python_version),
                 ("Setting up virtual environment", setup_virtual_environment),
@@ -1356,7 +1653,7 @@ def main():
             
             failed_steps = []
             for step_name, step_func in quick_steps:
-                if not safe_step_execution(step_name, step_func):
+                if not safe_step_execution(step_name, step_func, capture_tb=False):
                     failed_steps.append(step_name)
             
             logger.info(f"Quick setup completed. Failed steps: {len(failed_steps)}")
@@ -1365,17 +1662,7 @@ def main():
             
         elif sys.argv[1] == "--frontend":
             logger.info("Starting frontend setup mode")
-            print("=" * 80)
-            print("""
-    ███████╗██████╗░░█████╗░███╗░░██╗████████╗███████╗███╗░░██╗██████╗░  ░██████╗███████╗████████╗██╗░░░██╗██████╗░
-    ██╔════╝██╔══██╗██╔══██╗████╗░██║╚══██╔══╝██╔════╝████╗░██║██╔══██╗  ██╔════╝██╔════╝╚══██╔══╝██║░░░██║██╔══██╗
-    █████╗░░██████╔╝██║░░██║██╔██╗██║░░░██║░░░█████╗░░██╔██╗██║██║░░██║  ╚█████╗░█████╗░░░░██║░░░██║░░░██║██████╔╝
-    ██╔══╝░░██╔══██╗██║░░██║██║╚████║░░░██║░░░██╔══╝░░██║╚████║██║░░██║  ░╚═══██╗██╔══╝░░░░██║░░░██║░░░██║██╔═══╝░
-    ██║░░░░░██║░░██║╚█████╔╝██║░╚███║░░░██║░░░███████╗██║░╚███║██████╔╝  ██████╔╝███████╗░░░██║░░░╚██████╔╝██║░░░░░
-    ╚═╝░░░░░╚═╝░░╚═╝░╚════╝░╚═╝░░╚══╝░░░╚═╝░░░╚══════╝╚═╝░░╚══╝╚═════╝░  ╚═════╝░╚══════╝░░░╚═╝░░░░╚═════╝░╚═════╝░
-            """)
-            print("🌐 FRONTEND SETUP MODE - Web Interface Configuration")
-            print("=" * 80)
+            write_block(BANNER_FRONTEND)
             frontend_steps = [
                 ("Checking Python version", check_python_version),
                 ("Setting up virtual environment", setup_virtual_environment),
@@ -1400,25 +1687,9 @@ def main():
             
         elif sys.argv[1] == "--help":
             logger.info("Displaying help information")
-            print("Voice Assistant Setup Options:")
-            print("  python setup_assistant.py          # Full setup (includes virtual environment)")
-            print("  python setup_assistant.py --quick  # Quick setup (no dependencies, includes venv)")
-            print("  python setup_assistant.py --frontend # Setup frontend only (includes venv)")
-            print("  python setup_assistant.py --recovery # Fix common issues")
-            print("  python setup_assistant.py --help   # Show this help")
-            print()
-            print("Virtual Environment:")
-            print("  The setup will create a .venv folder with isolated Python packages.")
-            print("  After setup, activate it with:")
-            if platform.system() == "Windows":
-                print("    .venv\\Scripts\\activate")
-            else:
-                print("    source .venv/bin/activate")
-            print()
-            print("Error Handling:")
-            print("  • All errors are logged to logs/setup_error.log")
-            print("  • Use --recovery mode to fix common issues")
-            print("  • Check troubleshooting guide after failed setup")
+            import platform
+            activate_cmd = ".venv\\Scripts\\activate" if platform.system() == "Windows" else "source .venv/bin/activate"
+            write_block(HELP_TEXT.format(activate_cmd=activate_cmd))
             return
     
     # Main setup with prerequisites check
@@ -1426,6 +1697,9 @@ def main():
         logger.info("Starting full setup mode")
         print_banner()
         
+        # Probe the host once; the steps below read from this snapshot
+        log_system_info(asdict(get_capabilities()))
+        
         # Check prerequisites first
         if not check_prerequisites():
             logger.error("Prerequisites check failed - aborting setup")
@@ -1433,39 +1707,60 @@ def main():
             print("💡 Try recovery mode: python setup_assistant.py --recovery")
             return
         
-        # Setup steps
-        steps = [
+        # Setup steps, in three phases: environment/installation steps run in
+        # order, then the independent checks run concurrently, then the
+        # steps that initialize audio/TTS engines and the end-to-end tests
+        # that depend on everything before them
+        install_steps = [
             ("Checking Python version", check_python_version),
             ("Setting up virtual environment", setup_virtual_environment),
-            ("Checking system requirements", check_system_requirements),
-            ("Checking audio system", check_audio_system),
             ("Checking ffmpeg installation", setup_ffmpeg),
             ("Creating directories", create_directories),
             ("Installing dependencies", install_dependencies),
             ("Setting up frontend", setup_frontend),
-            ("Checking optional dependencies", check_optional_dependencies),
             ("Setting up environment", setup_environment),
             ("Validating configuration", validate_configuration),
+        ]
+        parallel_steps = [
+            ("Checking system requirements", check_system_requirements),
+            ("Checking audio system", check_audio_system),
+            ("Checking optional dependencies", check_optional_dependencies),
             ("Downloading/checking models", download_models),
+        ]
+        final_steps = [
             ("Generating audio assets", generate_audio_assets),
-            ("Testing basic functionality", test_basic_functionality),
             ("Validating plugins", validate_plugins),
+            ("Testing basic functionality", test_basic_functionality),
             ("Running health check", run_health_check)
         ]
+        steps = install_steps + parallel_steps + final_steps
         
         logger.info(f"Starting {len(steps)} setup steps")
         failed_steps = []
+        failed_tags = set()
         error_log = {}
         
-        for step_name, step_func in steps:
+        def record_failure(step_name):
+            failed_steps.append(step_name)
+            if step_name in STEP_TAG:
+                failed_tags.add(STEP_TAG[step_name])
+        
+        for step_name, step_func in install_steps:
+            if not safe_step_execution(step_name, step_func):
+                record_failure(step_name)
+        
+        for step_name in run_steps_concurrently(parallel_steps):
+            record_failure(step_name)
+        
+        for step_name, step_func in final_steps:
             if not safe_step_execution(step_name, step_func):
-                failed_steps.append(step_name)
+                record_failure(step_name)
         
         logger.info(f"Setup completed. Failed steps: {len(failed_steps)}/{len(steps)}")
         if failed_steps:
             logger.error(f"Failed steps: {', '.join(failed_steps)}")
         
-        print_setup_summary(failed_steps, error_log)
+        print_setup_summary(failed_steps, error_log, failed_tags)
         
         if not failed_steps:
             logger.info("Setup completed successfully - all steps passed")
@@ -1480,6 +1775,7 @@ def main():
         print("\n\n⏹️  Setup interrupted by user")
         print("You can resume setup by running the command again.")
     except Exception as e:
+        import traceback
         logger.critical(f"Critical setup error: {e}")
         logger.critical(f"Traceback:\n{traceback.format_exc()}")
         print(f"\n❌ Critical setup error: {e}")
@@ -5,6 +5,7 @@ Test script for the updated STT Whisper plugin
 
 import sys
 import os
+import functools
 from pathlib import Path
 
 # Add project root to path
@@ -60,11 +61,7 @@ def test_whisper_plugin():
             "outputs/sound/test.wav"
         ]
         
-        test_file = None
-        for audio_file in test_audio_files:
-            if Path(audio_file).exists():
-                test_file = audio_file
-                break
+        test_file = next((f for f in test_audio_files if os.path.isfile(f)), None)
         
         if test_file:
             print(f"   Using test file: {test_file}")
@@ -89,6 +86,12 @@ def test_whisper_plugin():
         print(f"❌ Plugin test failed: {e}")
         return False
 
+@functools.lru_cache(maxsize=None)
+def _whisper_models():
+    """Return the list of Whisper model names (looked up once per process)."""
+    import whisper
+    return whisper.available_models()
+
 def show_whisper_info():
     """Show information about available Whisper packages"""
     
@@ -103,7 +106,7 @@ def show_whisper_info():
         
         # List available models
         try:
-            models = whisper.available_models()
+            models = _whisper_models()
             print(f"   Available models: {', '.join(models)}")
         except:
             print("   Available models: base, small, medium, large")
@@ -3,16 +3,64 @@ Audio Effects and Sound Management System
 Manages sound effects, audio feedback, and audio assets
 """
 
+import importlib
 import logging
+import math
+import os
 import threading
 import time
+import wave
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Optional modules resolved on first use: name -> module, or None if unavailable
+_OPTIONAL_MODULES = {}
+
+def _lazy_import(name):
+    """Import an optional module once and memoize it (None when it cannot be imported)."""
+    if name not in _OPTIONAL_MODULES:
+        try:
+            _OPTIONAL_MODULES[name] = importlib.import_module(name)
+        except Exception:
+            # soundfile raises OSError when libsndfile is missing, not ImportError
+            _OPTIONAL_MODULES[name] = None
+    return _OPTIONAL_MODULES[name]
+
+# Playable asset extensions, in lookup priority order
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.ogg')
+
+# Mixer format requested by _init_pygame; another plugin may already have opened
+# the mixer with pygame's defaults, so decoding follows pygame.mixer.get_init()
+MIXER_SAMPLE_RATE = 22050
+MIXER_CHANNELS = 1
+
+# Assets whose decoded PCM exceeds this are streamed from disk instead of cached
+SOUND_CACHE_MAX_BYTES = 1 << 20
+
+# Tone frequency (Hz) used for each generated default asset
+DEFAULT_TONE_FREQUENCIES = {
+    'start.wav': 800,
+    'stop.wav': 400,
+    'success.wav': 1000,
+    'error.wav': 300,
+    'notification.wav': 600,
+    'welcome.wav': 800,
+    'goodbye.wav': 500,
+    'audio.wav': 750
+}
+
 class AudioEffectsManager:
     """Manages audio effects and sound feedback."""
     
+    # Decoded assets shared by every manager: absolute file path -> pygame Sound
+    # (None when the asset is too large to cache or failed to decode)
+    _shared_sounds = {}
+    _shared_lock = threading.Lock()
+    
+    # pygame mixer is opened on first file playback and kept open (process-wide)
+    _pygame_ready = False
+    
     def __init__(self, config):
         """
         Initialize audio effects manager.
@@ -31,13 +79,37 @@ class AudioEffectsManager:
         # Audio assets directory
         self.assets_dir = Path("assets/audio")
         
+        # Asset files found in assets_dir: sound name -> Path
+        self._asset_index = {}
+        
+        # Set once default assets are generated and indexed
+        self._assets_ready = threading.Event()
+        
         # Load sound effects engine
         self.fx_engine = None
         if self.enabled:
             self._load_engine()
         
-        # Create default audio files if they don't exist
-        self._ensure_audio_assets()
+        # Index what already exists, then generate the rest in the background
+        # so tone synthesis and disk writes do not delay assistant startup
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        self._build_asset_index()
+        threading.Thread(
+            target=self._async_ensure_assets,
+            name="audio-assets",
+            daemon=True
+        ).start()
+    
+    def _async_ensure_assets(self):
+        """Create missing default assets and reindex them (runs on a worker thread)."""
+        try:
+            # Create default audio files if they don't exist
+            self._ensure_audio_assets()
+            self._build_asset_index()
+        except Exception as e:
+            self.logger.error(f"Failed to prepare audio assets: {e}")
+        finally:
+            self._assets_ready.set()
     
     def _load_engine(self):
         """Load sound effects engine."""
@@ -85,117 +157,191 @@ class AudioEffectsManager:
         except Exception as e:
             self.logger.error(f"Failed to play sound '{sound_type}': {e}")
     
+    def _cached_sound(self, pygame, audio_file):
+        """Return the in-memory Sound for an asset, decoding it on first use."""
+        key = os.path.abspath(audio_file)
+        with self._shared_lock:
+            # Each file is decoded once, whichever manager plays it first
+            if key not in self._shared_sounds:
+                try:
+                    self._shared_sounds[key] = self._load_sound(pygame, audio_file)
+                except Exception as e:
+                    self.logger.warning(f"Failed to load sound '{audio_file.name}': {e}")
+                    self._shared_sounds[key] = None
+            return self._shared_sounds[key]
+    
+    def _load_sound(self, pygame, audio_file):
+        """Decode an asset to PCM in the mixer's format; None if it is too large to cache."""
+        frequency, size, channels = pygame.mixer.get_init()
+        
+        # Raw buffers are only built for signed 16-bit mixers; pygame converts
+        # files itself for any other format
+        if size == -16 and audio_file.suffix.lower() in ('.mp3', '.ogg'):
+            pydub = _lazy_import('pydub')
+            if pydub is not None:
+                # Decode compressed assets once, straight to the open mixer's format
+                segment = pydub.AudioSegment.from_file(str(audio_file))
+                segment = segment.set_frame_rate(frequency).set_channels(channels).set_sample_width(2)
+                if len(segment.raw_data) > SOUND_CACHE_MAX_BYTES:
+                    self.logger.debug(f"Not caching '{audio_file.name}': decoded size exceeds limit")
+                    return None
+                return pygame.mixer.Sound(buffer=segment.raw_data)
+        
+        sound = pygame.mixer.Sound(str(audio_file))
+        if sound.get_length() * frequency * channels * (abs(size) // 8) > SOUND_CACHE_MAX_BYTES:
+            self.logger.debug(f"Not caching '{audio_file.name}': decoded size exceeds limit")
+            return None
+        return sound
+    
+    def _build_asset_index(self):
+        """Index the audio assets by sound name with a single directory scan."""
+        index = {}
+        try:
+            with os.scandir(self.assets_dir) as entries:
+                for entry in entries:
+                    name, ext = os.path.splitext(entry.name)
+                    ext = ext.lower()
+                    if ext not in AUDIO_EXTENSIONS or not entry.is_file():
+                        continue
+                    # Prefer .wav over .mp3 over .ogg when a sound exists in several formats
+                    current = index.get(name)
+                    if current is None or AUDIO_EXTENSIONS.index(ext) < AUDIO_EXTENSIONS.index(current.suffix.lower()):
+                        index[name] = Path(entry.path)
+        except OSError as e:
+            self.logger.warning(f"Failed to scan audio assets: {e}")
+        self._asset_index = index
+    
     def _play_audio_file(self, filename):
         """Play audio file from assets directory."""
         try:
-            # Try different extensions
-            extensions = ['.wav', '.mp3', '.ogg']
-            audio_file = None
-            
-            for ext in extensions:
-                file_path = self.assets_dir / f"{filename}{ext}"
-                if file_path.exists():
-                    audio_file = file_path
-                    break
+            audio_file = self._asset_index.get(filename)
             
             if not audio_file:
-                self.logger.warning(f"Audio file not found: {filename}")
+                if self._assets_ready.wait(timeout=0):
+                    self.logger.warning(f"Audio file not found: {filename}")
+                else:
+                    self.logger.debug(f"Audio asset '{filename}' is still being prepared")
                 return
             
+            # The mixer is opened on first playback; later plays retrigger from memory
+            pygame = self._init_pygame()
+            if pygame is not None:
+                sound = self._cached_sound(pygame, audio_file)
+                if sound is not None:
+                    sound.set_volume(self.volume)
+                    sound.play()
+                    return
+            
             # Play the file
             self._play_file(str(audio_file))
             
         except Exception as e:
             self.logger.error(f"Failed to play audio file '{filename}': {e}")
     
+    def _init_pygame(self):
+        """Open the pygame mixer once; returns None if pygame is missing."""
+        pygame = _lazy_import('pygame')
+        if pygame is not None and not AudioEffectsManager._pygame_ready:
+            with self._shared_lock:
+                if not AudioEffectsManager._pygame_ready:
+                    pygame.mixer.pre_init(frequency=MIXER_SAMPLE_RATE, size=-16, channels=MIXER_CHANNELS, buffer=512)
+                    pygame.mixer.init()
+                    # Several channels so overlapping effects do not cut each other off
+                    pygame.mixer.set_num_channels(8)
+                    AudioEffectsManager._pygame_ready = True
+        return pygame
+    
     def _play_file(self, file_path):
         """Play audio file using available method."""
-        try:
-            # Try pygame first
-            import pygame
-            pygame.mixer.init()
+        # Try pygame first
+        pygame = self._init_pygame()
+        if pygame is not None:
             pygame.mixer.music.load(file_path)
             pygame.mixer.music.set_volume(self.volume)
             pygame.mixer.music.play()
-            
-            # Wait for playback in a separate thread
-            def wait_for_playback():
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-            
-            threading.Thread(target=wait_for_playback, daemon=True).start()
-            
-        except ImportError:
+            return
+        
+        # Try playsound
+        playsound = _lazy_import('playsound')
+        if playsound is not None:
+            playsound.playsound(file_path, block=False)
+            return
+        
+        # Try the native Windows player (asynchronous, no child process)
+        winsound = _lazy_import('winsound')
+        if winsound is not None:
             try:
-                # Try playsound
-                from playsound import playsound
-                playsound(file_path, block=False)
-            except ImportError:
-                try:
-                    # Try system command (Windows)
-                    import subprocess
-                    subprocess.run([
-                        'powershell', '-c', 
-                        f'(New-Object Media.SoundPlayer "{file_path}").PlaySync()'
-                    ], check=True, capture_output=True)
-                except:
-                    self.logger.warning("No audio playback method available")
+                winsound.PlaySound(
+                    file_path,
+                    winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT
+                )
+                return
+            except Exception:
+                pass
+        
+        self.logger.warning("No audio playback method available")
     
     def _ensure_audio_assets(self):
         """Create default audio assets if they don't exist."""
         self.assets_dir.mkdir(parents=True, exist_ok=True)
         
-        # List of audio files that should exist
-        audio_files = [
-            'start.wav', 'stop.wav', 'success.wav', 'error.wav',
-            'notification.wav', 'welcome.wav', 'goodbye.wav', 'audio.wav'
+        # Audio files that should exist; collect the missing ones first
+        missing = [
+            self.assets_dir / audio_file
+            for audio_file in DEFAULT_TONE_FREQUENCIES
+            if not (self.assets_dir / audio_file).exists()
         ]
         
-        for audio_file in audio_files:
-            file_path = self.assets_dir / audio_file
-            if not file_path.exists():
-                self._create_default_audio(file_path)
+        if missing:
+            self._create_default_audio_files(missing)
     
     def _create_default_audio(self, file_path):
         """Create a default audio file."""
-        try:
-            import numpy as np
-            import soundfile as sf
-            
-            # Generate a simple tone based on filename
-            duration = 0.5
-            sample_rate = 22050
-            
-            # Determine frequency based on filename
-            frequency_map = {
-                'start.wav': 800,
-                'stop.wav': 400,
-                'success.wav': 1000,
-                'error.wav': 300,
-                'notification.wav': 600,
-                'welcome.wav': 800,
-                'goodbye.wav': 500,
-                'audio.wav': 750
-            }
-            
-            frequency = frequency_map.get(file_path.name, 600)
-            
-            # Generate tone
-            t = np.linspace(0, duration, int(sample_rate * duration), False)
-            wave = np.sin(frequency * 2 * np.pi * t) * 0.3
-            
-            # Apply fade in/out
-            fade_samples = int(sample_rate * 0.05)  # 50ms fade
-            if len(wave) > 2 * fade_samples:
-                wave[:fade_samples] *= np.linspace(0, 1, fade_samples)
-                wave[-fade_samples:] *= np.linspace(1, 0, fade_samples)
-            
-            # Save the file
-            sf.write(str(file_path), wave, sample_rate)
-            self.logger.info(f"Created default audio file: {file_path.name}")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to create default audio file {file_path.name}: {e}")
+        self._create_default_audio_files([file_path])
+    
+    def _create_default_audio_files(self, file_paths):
+        """Create default audio files, generating all tones in one vectorized pass."""
+        np = _lazy_import('numpy')
+        if np is None:
+            self.logger.error("Failed to create default audio files: numpy is required")
+            return
+        
+        # Generate a simple tone per file based on filename
+        duration = 0.5
+        sample_rate = 22050
+        
+        # One row per file, computed in float32 and stored as 16-bit PCM. An
+        # integer-Hz tone repeats exactly every sample_rate / gcd(freq, sample_rate)
+        # samples, so only that block is evaluated with sin and then repeated.
+        n_samples = int(sample_rate * duration)
+        rows = []
+        for file_path in file_paths:
+            frequency = DEFAULT_TONE_FREQUENCIES.get(file_path.name, 600)
+            block = sample_rate // math.gcd(frequency, sample_rate)
+            phase = 2 * np.pi * frequency * np.arange(min(block, n_samples)) / sample_rate
+            rows.append(np.resize(np.sin(phase).astype(np.float32), n_samples))
+        waves = np.stack(rows) * np.float32(0.3)
+        
+        # Apply fade in/out to every row at once (before the integer conversion)
+        fade_samples = int(sample_rate * 0.05)  # 50ms fade
+        if waves.shape[1] > 2 * fade_samples:
+            waves[:, :fade_samples] *= np.linspace(0, 1, fade_samples, dtype=np.float32)
+            waves[:, -fade_samples:] *= np.linspace(1, 0, fade_samples, dtype=np.float32)
+        
+        # WAV stores little-endian samples
+        pcm = (waves * 32767).astype('<i2')
+        
+        # Save the files (plain 16-bit mono WAV, written with the stdlib)
+        for file_path, samples in zip(file_paths, pcm):
+            try:
+                with wave.open(str(file_path), 'wb') as wav_file:
+                    wav_file.setnchannels(1)
+                    wav_file.setsampwidth(2)
+                    wav_file.setframerate(sample_rate)
+                    wav_file.writeframes(samples.tobytes())
+                self.logger.info(f"Created default audio file: {file_path.name}")
+            except Exception as e:
+                self.logger.error(f"Failed to create default audio file {file_path.name}: {e}")
     
     # Convenience methods for common sounds
     def play_start(self):
@@ -244,10 +390,7 @@ class AudioEffectsManager:
             sounds.extend(self.fx_engine.keys())
         
         # Add asset sounds
-        if self.assets_dir.exists():
-            for audio_file in self.assets_dir.glob('*'):
-                if audio_file.suffix.lower() in ['.wav', '.mp3', '.ogg']:
-                    sounds.append(audio_file.stem)
+        sounds.extend(self._asset_index)
         
         return list(set(sounds))
     
@@ -274,5 +417,6 @@ class AudioEffectsManager:
             'engine': self.engine,
             'volume': self.volume,
             'available_sounds': self.get_available_sounds(),
+            'assets_ready': self._assets_ready.is_set(),
             'assets_directory': str(self.assets_dir)
         }
@@ -4,7 +4,14 @@ Handles speech-to-text conversion with plugin support
 """
 
 import importlib
+import importlib.util
 import logging
+import queue
+import threading
+import time
+
+# Marks the end of the captured frame stream in transcribe_live
+_END_OF_STREAM = object()
 
 class AudioTranscription:
     """Speech-to-Text wrapper with plugin support."""
@@ -25,6 +32,35 @@ class AudioTranscription:
         if not self.stt_engine:
             self.logger.error("Failed to load any STT engine")
             raise Exception("No STT engine could be loaded")
+        
+        # Resolve the engine entry points once for the transcription hot path
+        self._transcribe_fn = getattr(self.stt_engine, 'transcribe', None)
+        self._transcribe_live_fn = getattr(self.stt_engine, 'transcribe_live', None)
+        self._stream_transcribe_fn = getattr(self.stt_engine, 'stream_transcribe', None)
+        
+        # Load model weights now rather than on the first utterance
+        try:
+            getattr(self.stt_engine, 'warmup', lambda: None)()
+        except Exception as e:
+            self.logger.warning(f"STT engine warmup failed: {e}")
+    
+    @classmethod
+    def probe(cls, config):
+        """
+        Check that an STT engine plugin can be found, without importing it.
+        
+        Returns:
+            tuple: (available, message)
+        """
+        primary = config.get('stt.primary_engine', 'whisper_cpp')
+        engines = [primary] + [e for e in config.get('stt.fallback_engines', []) if e != primary]
+        for engine in engines:
+            try:
+                if importlib.util.find_spec(f'plugins.stt_{engine}') is not None:
+                    return True, f"STT engine plugin found: {engine}"
+            except (ImportError, ValueError):
+                continue
+        return False, f"No STT engine plugin found (tried: {', '.join(engines)})"
     
     def _load_stt_engine(self, engine_name):
         """Load an STT engine plugin."""
@@ -61,8 +97,8 @@ class AudioTranscription:
         """
         try:
             # Call the STT engine
-            if hasattr(self.stt_engine, 'transcribe'):
-                return self.stt_engine.transcribe(audio_file, self.language)
+            if self._transcribe_fn is not None:
+                return self._transcribe_fn(audio_file, self.language)
             else:
                 self.logger.error("STT engine does not have 'transcribe' method")
                 return None
@@ -82,8 +118,15 @@ class AudioTranscription:
             str: Transcribed text or None if failed
         """
         try:
-            if hasattr(self.stt_engine, 'transcribe_live'):
-                return self.stt_engine.transcribe_live(duration, self.language)
+            # Overlap recording with recognition when the engine can stream
+            if self._stream_transcribe_fn is not None:
+                rate = self.config.get('audio.input.sample_rate', 16000)
+                frames = self._capture_frames(duration, rate)
+                if frames is not None:
+                    return self._stream_transcribe_fn(frames, self.language, sample_rate=rate)
+            
+            if self._transcribe_live_fn is not None:
+                return self._transcribe_live_fn(duration, self.language)
             else:
                 # Fallback to regular transcription
                 return self.transcribe_audio()
@@ -92,6 +135,72 @@ class AudioTranscription:
             self.logger.error(f"Live STT transcription failed: {e}")
             return None
     
+    def _capture_frames(self, duration, rate):
+        """
+        Record from the microphone on a background thread.
+        
+        Frames go through a bounded queue so the STT engine can consume them
+        while recording continues.
+        
+        Args:
+            duration (int): Recording duration in seconds
+            rate (int): Capture sample rate in Hz
+            
+        Returns:
+            iterator: LINEAR16 byte chunks, or None if capture is unavailable
+        """
+        try:
+            import pyaudio
+        except ImportError:
+            self.logger.warning("pyaudio not available - streaming transcription disabled")
+            return None
+        
+        chunk = self.config.get('audio.input.chunk_size', 1024)
+        
+        # Room for ~2 seconds of audio; a stalled consumer drops frames instead of blocking capture
+        frames = queue.Queue(maxsize=max(1, 2 * rate // chunk))
+        
+        def audio_callback(in_data, frame_count, time_info, status):
+            try:
+                frames.put_nowait(in_data)
+            except queue.Full:
+                self.logger.debug("STT consumer lagging - dropped an audio frame")
+            return (None, pyaudio.paContinue)
+        
+        def record():
+            audio_interface = pyaudio.PyAudio()
+            stream = None
+            try:
+                stream = audio_interface.open(
+                    format=pyaudio.paInt16,
+                    channels=1,
+                    rate=rate,
+                    input=True,
+                    frames_per_buffer=chunk,
+                    stream_callback=audio_callback,
+                )
+                time.sleep(duration)
+                stream.stop_stream()
+            except Exception as e:
+                self.logger.error(f"Microphone capture failed: {e}")
+            finally:
+                if stream is not None:
+                    stream.close()
+                audio_interface.terminate()
+                # Never block on a full queue: drop the oldest frame to make room
+                while True:
+                    try:
+                        frames.put_nowait(_END_OF_STREAM)
+                        break
+                    except queue.Full:
+                        try:
+                            frames.get_nowait()
+                        except queue.Empty:
+                            pass
+        
+        threading.Thread(target=record, daemon=True).start()
+        return iter(frames.get, _END_OF_STREAM)
+    
     def get_supported_languages(self):
         """Get list of supported languages from the STT engine."""
         if hasattr(self.stt_engine, 'get_languages'):
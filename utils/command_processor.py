@@ -3,14 +3,68 @@ Voice Command Processor
 Handles voice commands and responses for the assistant
 """
 
+import ast
+import functools
 import logging
+import operator
 import re
 import datetime
 import random
 from pathlib import Path
 
+# Optional multi-pattern matcher (python-hyperscan); falls back to re when missing
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Characters that may appear in a bare arithmetic expression
+_SAFE_CALC_CHARS = frozenset('0123456789+-*/.() ')
+
+# Parsed arithmetic expressions, keyed by source text
+_EVAL_CACHE = {}
+_EVAL_CACHE_MAX = 256
+
+# Operators allowed in spoken arithmetic
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+def _eval_node(node):
+    """Evaluate a whitelisted arithmetic AST node."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        return _BIN_OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+def _safe_eval(expr):
+    """
+    Evaluate a simple arithmetic expression without eval().
+    
+    Only numbers, + - * /, unary signs and parentheses are accepted; anything
+    else (names, calls, attributes, powers) raises ValueError.
+    """
+    tree = _EVAL_CACHE.get(expr)
+    if tree is None:
+        tree = ast.parse(expr, mode='eval')
+        if len(_EVAL_CACHE) >= _EVAL_CACHE_MAX:
+            _EVAL_CACHE.clear()
+        _EVAL_CACHE[expr] = tree
+    return _eval_node(tree.body)
+
 class VoiceCommandProcessor:
     """Processes voice commands and generates appropriate responses."""
     
@@ -68,6 +122,27 @@ class VoiceCommandProcessor:
             ]
         }
         
+        # One case-insensitive alternation per command type, built from command_patterns
+        self._compiled_patterns = {
+            command_type: self._compile_patterns(patterns)
+            for command_type, patterns in self.command_patterns.items()
+        }
+        
+        # Hyperscan database over all patterns, built lazily (None = not built yet);
+        # set before the keyword map, which classifies phrases with _match_patterns
+        self._hs_db = None
+        self._hs_types = []
+        self._hs_failed = False
+        
+        # Plain command phrases ("halo", "sampai jumpa") resolved without any regex work
+        self._keyword_map = self._build_keyword_map()
+        
+        # Private RNG for picking responses (no shared module-level random state)
+        self._rng = random.Random()
+        
+        # Repeated phrases ("halo", "jam berapa") skip the pattern scan entirely
+        self._classify_cached = functools.lru_cache(maxsize=512)(self._classify_command)
+        
         # Response templates
         self.responses = {
             'greeting': [
@@ -108,6 +183,12 @@ class VoiceCommandProcessor:
                 "Perintah tidak dikenali. Katakan 'bantuan' untuk melihat daftar perintah."
             ]
         }
+        
+        # Pre-bound responder per command type (text -> response string)
+        self._responders = {
+            command_type: self._make_responder(template)
+            for command_type, template in self.responses.items()
+        }
     
     def process_command(self, text):
         """
@@ -122,11 +203,12 @@ class VoiceCommandProcessor:
         if not text or not text.strip():
             return "Maaf, saya tidak mendengar apa-apa."
         
-        text = text.lower().strip()
+        # Normalize case and whitespace so variants of a phrase share one cache entry
+        text = " ".join(text.lower().split())
         self.logger.info(f"Processing command: {text}")
         
         # Find matching command type
-        command_type = self._classify_command(text)
+        command_type = self._classify_cached(text)
         
         # Get response
         response = self._generate_response(command_type, text)
@@ -134,27 +216,88 @@ class VoiceCommandProcessor:
         self.logger.info(f"Command type: {command_type}, Response: {response[:50]}...")
         return response
     
+    @staticmethod
+    def _compile_patterns(patterns):
+        """Compile a list of regex patterns into a single alternation."""
+        return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+    
+    def _get_hyperscan_db(self):
+        """Build (once) a Hyperscan database with one expression per command type."""
+        if self._hs_db is None and not self._hs_failed:
+            try:
+                self._hs_types = list(self._compiled_patterns)
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[regex.pattern.encode('utf-8') for regex in self._compiled_patterns.values()],
+                    ids=list(range(len(self._hs_types))),
+                    flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(self._hs_types)
+                )
+                self._hs_db = db
+            except Exception as e:
+                self.logger.warning(f"Hyperscan unavailable for command patterns, using re: {e}")
+                self._hs_failed = True
+        return self._hs_db
+    
+    def _build_keyword_map(self):
+        """
+        Map the literal alternatives of every pattern to their command type.
+        
+        Alternatives containing regex syntax other than '.*' (treated as a space)
+        are left to the pattern scan. Each phrase is classified by the pattern scan
+        itself, so a keyword hit always agrees with what the regexes would return.
+        """
+        keyword_map = {}
+        for patterns in self.command_patterns.values():
+            for pattern in patterns:
+                for alternative in pattern.split('|'):
+                    phrase = alternative.replace('.*', ' ').strip().lower()
+                    if phrase and all(re.escape(word) == word for word in phrase.split()):
+                        keyword_map[phrase] = self._match_patterns(phrase)
+        return keyword_map
+    
     def _classify_command(self, text):
         """Classify the command type based on text patterns."""
-        for command_type, patterns in self.command_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return command_type
-        return 'unknown'
+        # Whole-utterance keyword hit skips the pattern scan (text is normalized)
+        command_type = self._keyword_map.get(text)
+        if command_type is not None:
+            return command_type
+        return self._match_patterns(text)
     
-    def _generate_response(self, command_type, text):
-        """Generate response for command type."""
-        response_template = self.responses.get(command_type, self.responses['unknown'])
+    def _match_patterns(self, text):
+        """Return the first command type whose patterns match the text."""
+        db = self._get_hyperscan_db() if HYPERSCAN_AVAILABLE else None
+        if db is not None:
+            # Single pass over the text; the earliest command type wins, as with re
+            matched = []
+            
+            def on_match(pattern_id, start, end, flags, context):
+                matched.append(pattern_id)
+            
+            db.scan(text.encode('utf-8'), match_event_handler=on_match)
+            return self._hs_types[min(matched)] if matched else 'unknown'
         
+        for command_type, regex in self._compiled_patterns.items():
+            if regex.search(text):
+                return command_type
+        return 'unknown'
+    
+    def _make_responder(self, response_template):
+        """Wrap a response template in a callable taking the command text."""
         # Handle function responses
         if callable(response_template):
-            return response_template(text)
+            return response_template
         
         # Handle list responses
         if isinstance(response_template, list):
-            return random.choice(response_template)
+            choice = self._rng.choice
+            return lambda _text, _options=response_template: choice(_options)
         
-        return str(response_template)
+        response = str(response_template)
+        return lambda _text: response
+    
+    def _generate_response(self, command_type, text):
+        """Generate response for command type."""
+        return self._responders.get(command_type, self._responders['unknown'])(text)
     
     def _get_current_time(self, text=None):
         """Get current time and date."""
@@ -195,15 +338,12 @@ class VoiceCommandProcessor:
                 
                 return f"Hasil dari {num1} {operator} {num2} adalah {result}"
             
-            # Try to evaluate simple expressions
-            # WARNING: This is potentially unsafe for user input
-            # In production, use a proper math expression parser
-            safe_chars = set('0123456789+-*/.() ')
-            if all(c in safe_chars for c in text):
+            # Try to evaluate simple expressions (whitelisted AST, no eval)
+            if set(text) <= _SAFE_CALC_CHARS:
                 try:
-                    result = eval(text)
+                    result = _safe_eval(text)
                     return f"Hasilnya adalah {result}"
-                except:
+                except Exception:
                     pass
             
             return "Maaf, saya tidak bisa menghitung itu. Coba gunakan format seperti '5 plus 3' atau '10 kali 2'."
@@ -222,7 +362,13 @@ class VoiceCommandProcessor:
             responses (list or callable): List of responses or function
         """
         self.command_patterns[command_type] = patterns
+        self._compiled_patterns[command_type] = self._compile_patterns(patterns)
+        self._hs_db = None  # rebuilt on next classification
+        self._hs_failed = False
+        self._keyword_map = self._build_keyword_map()
+        self._classify_cached.cache_clear()
         self.responses[command_type] = responses
+        self._responders[command_type] = self._make_responder(responses)
         self.logger.info(f"Added custom command: {command_type}")
     
     def get_command_types(self):
@@ -3,13 +3,69 @@ Health Check System
 Comprehensive health checks for voice assistant components
 """
 
+import functools
+import hashlib
+import importlib
+import importlib.util
+import json
 import logging
 import time
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import IntEnum
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Last report is persisted so back-to-back invocations (e.g. setup followed
+# by `cli.py health`) do not re-run every probe
+CACHE_FILE = Path("logs") / "healthcheck.cache.json"
+CACHE_TTL = 5  # seconds
+
+# In-process result cache: healthy results are reused for the configured
+# health_check.cache_ttl, results containing errors only for this long
+DEFAULT_RESULT_TTL = 30  # seconds
+ERROR_RESULT_TTL = 5  # seconds
+
+# Audio assets every installation should have, in report order
+_EXPECTED_ASSETS = (
+    'audio.wav', 'start.wav', 'stop.wav', 'error.wav',
+    'success.wav', 'notification.wav', 'welcome.wav', 'goodbye.wav'
+)
+_EXPECTED_ASSET_SET = frozenset(_EXPECTED_ASSETS)
+
+# Prebuilt per-asset results: filename -> (found result, missing result)
+_ASSET_RESULTS = {
+    filename: (
+        {"status": "ok", "message": f"{filename} found"},
+        {"status": "warning", "message": f"{filename} missing"}
+    )
+    for filename in _EXPECTED_ASSETS
+}
+
+class Status(IntEnum):
+    """Check severity; the worst status across all checks is the overall status."""
+    OK = 0
+    WARNING = 1
+    ERROR = 2
+
+# Status strings used in check results -> severity (unlisted ones, e.g. "skipped", count as OK)
+_STATUS_SEVERITY = {"ok": Status.OK, "warning": Status.WARNING, "error": Status.ERROR}
+
+# Report formatting
+_STATUS_ICONS = {"ok": "✅", "warning": "⚠️", "error": "❌", "skipped": "⏭️"}
+_REPORT_RULE = "=" * 60
+_CATEGORY_RULE = "-" * 40
+
+@functools.lru_cache(maxsize=64)
+def _module_available(name):
+    """Check whether a module can be found without executing it (memoized)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
 class HealthChecker:
     """System health checker for voice assistant components."""
     
@@ -19,6 +75,41 @@ class HealthChecker:
         self.logger = logging.getLogger(__name__)
         self.checks = {}
         
+        # Cached results per check category (and "all" for the full report)
+        self.cache_ttl = config.get('health_check.cache_ttl', DEFAULT_RESULT_TTL)
+        self._cache = {}
+        self._cache_ts = {}
+        
+    def _result_ttl(self, has_errors):
+        """TTL for a cached result; error states expire sooner so recovery shows up quickly."""
+        return min(self.cache_ttl, ERROR_RESULT_TTL) if has_errors else self.cache_ttl
+        
+    def _cached(self, category, fn, ttl=None):
+        """Return the cached result for a category, running fn when it is missing or stale."""
+        ts = self._cache_ts.get(category)
+        if ts is not None and time.monotonic() - ts < self._cache[category][1]:
+            return self._cache[category][0]
+            
+        result = fn()
+        if ttl is None:
+            ttl = self._result_ttl(any(check.get("status") == "error" for check in result.values()))
+        self._cache[category] = (result, ttl)
+        self._cache_ts[category] = time.monotonic()
+        return result
+        
+    def invalidate(self, category=None):
+        """Drop cached results for one category, or all of them (e.g. after a config reload)."""
+        if category is None:
+            self._cache.clear()
+            self._cache_ts.clear()
+            # Packages may have been installed or removed since the last probe
+            _module_available.cache_clear()
+        else:
+            # The full reports are built from every category, so they go too
+            for key in (category, "all", "all_deep"):
+                self._cache.pop(key, None)
+                self._cache_ts.pop(key, None)
+        
     def check_dependencies(self):
         """Check if all required dependencies are available."""
         checks = {}
@@ -37,24 +128,64 @@ class HealthChecker:
             'requests': 'Online services'
         }
         
+        # Modules are located, not imported, so heavy packages (torch, whisper)
+        # are not loaded into the checker process; see check_models_deep()
+        
         # Check required modules
         for module in required_modules:
-            try:
-                __import__(module)
+            if _module_available(module):
                 checks[f"dependency_{module}"] = {"status": "ok", "message": f"{module} available"}
-            except ImportError:
+            else:
                 checks[f"dependency_{module}"] = {"status": "error", "message": f"{module} not found"}
         
         # Check optional modules  
         for module, description in optional_modules.items():
-            try:
-                __import__(module)
+            if _module_available(module):
                 checks[f"optional_{module}"] = {"status": "ok", "message": f"{module} available - {description}"}
-            except ImportError:
+            else:
                 checks[f"optional_{module}"] = {"status": "warning", "message": f"{module} not found - {description} disabled"}
                 
         return checks
         
+    def check_models_deep(self, deps=None):
+        """Import the AI model packages and build the speech systems (slow; opt-in via run_all_checks(deep=True)).
+        
+        deps maps module names to availability (see _dependency_status); packages
+        known to be missing are reported as skipped instead of being imported.
+        """
+        checks = {}
+        
+        for module in ('torch', 'whisper'):
+            if deps is not None and not deps.get(module, True):
+                checks[f"import_{module}"] = {"status": "skipped", "message": f"{module} not installed"}
+                continue
+            try:
+                importlib.import_module(module)
+                checks[f"import_{module}"] = {"status": "ok", "message": f"{module} imports successfully"}
+            except Exception as e:
+                checks[f"import_{module}"] = {"status": "warning", "message": f"{module} failed to import: {e}"}
+                
+        if checks["import_torch"]["status"] == "ok":
+            import torch
+            if torch.cuda.is_available():
+                checks["torch_cuda"] = {"status": "ok", "message": f"CUDA available ({torch.cuda.device_count()} device(s))"}
+            else:
+                checks["torch_cuda"] = {"status": "warning", "message": "CUDA not available - models run on CPU"}
+                
+        # Construct the speech systems for real
+        checks.update(self.check_models(deep=True, deps=deps))
+                
+        return checks
+        
+    @staticmethod
+    def _dependency_status(dependency_checks):
+        """Map module names to availability from check_dependencies results."""
+        return {
+            check_name.split("_", 1)[1]: result.get("status") == "ok"
+            for check_name, result in dependency_checks.items()
+            if check_name.startswith(("dependency_", "optional_"))
+        }
+        
     def check_configuration(self):
         """Check configuration files and settings."""
         checks = {}
@@ -83,10 +214,14 @@ class HealthChecker:
             
         return checks
         
-    def check_audio_system(self):
-        """Check audio system availability."""
+    def check_audio_system(self, deps=None):
+        """Check audio system availability (skipped quickly when deps says pyaudio is missing)."""
         checks = {}
         
+        if deps is not None and not deps.get('pyaudio', True):
+            checks["audio_system"] = {"status": "error", "message": "Audio system not available - pyaudio not installed"}
+            return checks
+            
         try:
             # Check if audio processing is available
             from helper.audio_processing import AudioProcessor
@@ -98,11 +233,11 @@ class HealthChecker:
                 # Check for input/output devices
                 try:
                     from utils.performance_monitor import AudioDeviceMonitor
-                    device_monitor = AudioDeviceMonitor(self.config)
-                    devices = device_monitor.get_audio_devices()
+                    with AudioDeviceMonitor(self.config) as device_monitor:
+                        devices = device_monitor.get_audio_devices()
                     
-                    input_devices = sum(1 for d in devices if d['max_input_channels'] > 0)
-                    output_devices = sum(1 for d in devices if d['max_output_channels'] > 0)
+                    input_devices = sum(1 for d in devices if d.max_input_channels > 0)
+                    output_devices = sum(1 for d in devices if d.max_output_channels > 0)
                     
                     checks["audio_input"] = {
                         "status": "ok" if input_devices > 0 else "warning",
@@ -113,8 +248,6 @@ class HealthChecker:
                         "message": f"{output_devices} output device(s) found"
                     }
                     
-                    device_monitor.cleanup()
-                    
                 except Exception as e:
                     checks["audio_devices"] = {"status": "warning", "message": f"Could not enumerate devices: {e}"}
                     
@@ -126,25 +259,39 @@ class HealthChecker:
             
         return checks
         
-    def check_models(self):
-        """Check availability of AI models."""
-        checks = {}
+    def check_models(self, deep=False, deps=None):
+        """Check availability of AI models.
         
-        # Check TTS models
-        try:
-            from utils.text_to_speech import TextToSpeech
-            tts = TextToSpeech(self.config)
-            checks["tts_system"] = {"status": "ok", "message": "TTS system available"}
-        except Exception as e:
-            checks["tts_system"] = {"status": "error", "message": f"TTS system error: {e}"}
+        By default each system only probes for its engine plugin; deep=True
+        constructs the TTS, STT and wake word systems for real (first boot).
+        When deps says torch is missing, the TTS and STT constructions are
+        skipped since their model loaders cannot succeed.
+        """
+        if not deep:
+            return self._probe_models()
             
-        # Check STT models
-        try:
-            from utils.audio_transcription import AudioTranscription
-            stt = AudioTranscription(self.config)
-            checks["stt_system"] = {"status": "ok", "message": "STT system available"}
-        except Exception as e:
-            checks["stt_system"] = {"status": "error", "message": f"STT system error: {e}"}
+        checks = {}
+        
+        if deps is not None and not deps.get('torch', True):
+            skipped = {"status": "skipped", "message": "torch not installed - model load not attempted"}
+            checks["tts_system"] = dict(skipped)
+            checks["stt_system"] = dict(skipped)
+        else:
+            # Check TTS models
+            try:
+                from utils.text_to_speech import TextToSpeech
+                tts = TextToSpeech(self.config)
+                checks["tts_system"] = {"status": "ok", "message": "TTS system available"}
+            except Exception as e:
+                checks["tts_system"] = {"status": "error", "message": f"TTS system error: {e}"}
+                
+            # Check STT models
+            try:
+                from utils.audio_transcription import AudioTranscription
+                stt = AudioTranscription(self.config)
+                checks["stt_system"] = {"status": "ok", "message": "STT system available"}
+            except Exception as e:
+                checks["stt_system"] = {"status": "error", "message": f"STT system error: {e}"}
             
         # Check wake word detection
         try:
@@ -159,31 +306,53 @@ class HealthChecker:
             
         return checks
         
+    def _probe_models(self):
+        """Lightweight model check: locate engine plugins without loading them."""
+        checks = {}
+        
+        # (check, module, class, engine dependencies from check_dependencies, failure status)
+        systems = [
+            ("tts_system", "utils.text_to_speech", "TextToSpeech", ("numpy", "soundfile"), "error"),
+            ("stt_system", "utils.audio_transcription", "AudioTranscription", ("numpy", "soundfile"), "error"),
+            ("wakeword_system", "utils.wake_word_detection", "WakeWordDetector", ("numpy", "pyaudio"), "warning"),
+        ]
+        for check_name, module_name, class_name, requires, failure_status in systems:
+            try:
+                missing = [name for name in requires if not _module_available(name)]
+                if missing:
+                    checks[check_name] = {"status": failure_status, "message": f"{class_name} unavailable - missing {', '.join(missing)}"}
+                    continue
+                
+                # The manager modules only import the stdlib at load time
+                module = importlib.import_module(module_name)
+                available, message = getattr(module, class_name).probe(self.config)
+                checks[check_name] = {"status": "ok" if available else failure_status, "message": message}
+            except Exception as e:
+                checks[check_name] = {"status": "error", "message": f"{class_name} probe error: {e}"}
+                
+        return checks
+        
     def check_assets(self):
         """Check availability of audio assets."""
         checks = {}
         
         assets_dir = Path("assets/audio")
-        if not assets_dir.exists():
+        try:
+            # One directory read instead of a stat per expected file
+            with os.scandir(assets_dir) as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
             checks["assets_dir"] = {"status": "warning", "message": "Audio assets directory not found"}
             return checks
             
         checks["assets_dir"] = {"status": "ok", "message": "Audio assets directory found"}
         
         # Check for expected audio files
-        expected_files = [
-            'audio.wav', 'start.wav', 'stop.wav', 'error.wav',
-            'success.wav', 'notification.wav', 'welcome.wav', 'goodbye.wav'
-        ]
-        
-        missing_files = []
-        for filename in expected_files:
-            file_path = assets_dir / filename
-            if file_path.exists():
-                checks[f"asset_{filename}"] = {"status": "ok", "message": f"{filename} found"}
-            else:
-                missing_files.append(filename)
-                checks[f"asset_{filename}"] = {"status": "warning", "message": f"{filename} missing"}
+        checks.update({
+            f"asset_{filename}": dict(_ASSET_RESULTS[filename][filename not in present])
+            for filename in _EXPECTED_ASSETS
+        })
+        missing_files = _EXPECTED_ASSET_SET - present
                 
         if missing_files:
             checks["assets_summary"] = {
@@ -195,79 +364,140 @@ class HealthChecker:
             
         return checks
         
-    def check_permissions(self):
-        """Check file and directory permissions."""
+    def check_permissions(self, do_write_probe=False):
+        """Check file and directory permissions.
+        
+        Writability is checked with os.access; do_write_probe=True additionally
+        writes and removes a temporary file (useful on first boot, where ACLs or
+        read-only mounts can make access() too optimistic).
+        """
         checks = {}
         
-        # Check write permissions for logs
-        logs_dir = Path("logs")
-        try:
-            logs_dir.mkdir(exist_ok=True)
-            test_file = logs_dir / "test_write.tmp"
-            test_file.write_text("test")
-            test_file.unlink()
-            checks["logs_permission"] = {"status": "ok", "message": "Logs directory writable"}
-        except Exception as e:
-            checks["logs_permission"] = {"status": "error", "message": f"Cannot write to logs directory: {e}"}
+        # Check write permissions for logs and outputs
+        for name in ("logs", "outputs"):
+            directory = Path(name)
+            try:
+                directory.mkdir(exist_ok=True)
+                if not os.access(directory, os.W_OK):
+                    raise PermissionError("access denied")
+                if do_write_probe:
+                    test_file = directory / "test_write.tmp"
+                    test_file.write_text("test")
+                    test_file.unlink()
+                checks[f"{name}_permission"] = {"status": "ok", "message": f"{name.capitalize()} directory writable"}
+            except Exception as e:
+                checks[f"{name}_permission"] = {"status": "error", "message": f"Cannot write to {name} directory: {e}"}
             
-        # Check write permissions for outputs
-        outputs_dir = Path("outputs")
+        return checks
+        
+    def _config_hash(self):
+        """Hash the current configuration so cached reports follow config changes."""
+        config_data = getattr(self.config, 'config', self.config)
+        serialized = json.dumps(config_data, sort_keys=True, default=str)
+        return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+        
+    def _load_cached_report(self):
+        """Return the cached report if it is fresh and matches the config, else None."""
         try:
-            outputs_dir.mkdir(exist_ok=True) 
-            test_file = outputs_dir / "test_write.tmp"
-            test_file.write_text("test")
-            test_file.unlink()
-            checks["outputs_permission"] = {"status": "ok", "message": "Outputs directory writable"}
-        except Exception as e:
-            checks["outputs_permission"] = {"status": "error", "message": f"Cannot write to outputs directory: {e}"}
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
             
-        return checks
+        if cached.get("config_hash") != self._config_hash():
+            return None
+        if time.time() - cached.get("report", {}).get("timestamp", 0) >= CACHE_TTL:
+            return None
+        return cached["report"]
         
-    def run_all_checks(self):
-        """Run all health checks and return comprehensive report."""
+    def _save_cached_report(self, report):
+        """Persist a report for reuse by the next invocation."""
+        try:
+            CACHE_FILE.parent.mkdir(exist_ok=True)
+            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({"config_hash": self._config_hash(), "report": report}, f)
+        except (OSError, TypeError) as e:
+            self.logger.debug(f"Could not cache health report: {e}")
+        
+    def run_all_checks(self, use_cache=False, deep=False, persist=True):
+        """Run all health checks and return comprehensive report.
+        
+        With use_cache=True, a report saved by a previous run less than
+        CACHE_TTL seconds ago (with the same configuration) is returned instead.
+        Within one HealthChecker, category results and the report itself are
+        reused until their TTL expires; call invalidate() to force a re-run.
+        With deep=True, model packages are also imported (check_models_deep).
+        With persist=False, a freshly run report is not written to CACHE_FILE.
+        """
+        if use_cache:
+            cached_report = self._load_cached_report()
+            if cached_report is not None:
+                self.logger.info("Using cached health check report")
+                return cached_report
+                
+        report_key = "all_deep" if deep else "all"
+        ts = self._cache_ts.get(report_key)
+        if ts is not None and time.monotonic() - ts < self._cache[report_key][1]:
+            return dict(self._cache[report_key][0])
+            
         start_time = time.time()
         
         self.logger.info("Running health checks...")
         
         all_checks = {}
         
+        # Dependencies run first so the other categories can skip work whose
+        # packages are already known to be missing
+        try:
+            all_checks["dependencies"] = self._cached("dependencies", self.check_dependencies)
+        except Exception as e:
+            self.logger.error(f"Error running dependencies checks: {e}")
+            all_checks["dependencies"] = {
+                "error": {"status": "error", "message": f"Check failed: {e}"}
+            }
+        deps = self._dependency_status(all_checks["dependencies"])
+        
         # Run all check categories
         check_categories = [
-            ("dependencies", self.check_dependencies),
             ("configuration", self.check_configuration), 
-            ("audio_system", self.check_audio_system),
+            ("audio_system", functools.partial(self.check_audio_system, deps=deps)),
             ("models", self.check_models),
             ("assets", self.check_assets),
             ("permissions", self.check_permissions)
         ]
+        if deep:
+            check_categories.append(("models_deep", functools.partial(self.check_models_deep, deps=deps)))
         
-        for category, check_func in check_categories:
-            try:
-                checks = check_func()
-                all_checks[category] = checks
-            except Exception as e:
-                self.logger.error(f"Error running {category} checks: {e}")
-                all_checks[category] = {
-                    "error": {"status": "error", "message": f"Check failed: {e}"}
-                }
+        # Categories are independent and mostly I/O bound, so they run side by
+        # side; keys are inserted up front to keep the report in declaration order
+        for category, _ in check_categories:
+            all_checks[category] = None
+            
+        with ThreadPoolExecutor(max_workers=len(check_categories)) as executor:
+            futures = {
+                executor.submit(self._cached, category, check_func): category
+                for category, check_func in check_categories
+            }
+            for future in as_completed(futures):
+                category = futures[future]
+                try:
+                    all_checks[category] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error running {category} checks: {e}")
+                    all_checks[category] = {
+                        "error": {"status": "error", "message": f"Check failed: {e}"}
+                    }
                 
-        # Generate summary
-        total_checks = sum(len(checks) for checks in all_checks.values())
-        ok_count = sum(
-            1 for checks in all_checks.values() 
-            for check in checks.values() 
-            if check.get("status") == "ok"
-        )
-        warning_count = sum(
-            1 for checks in all_checks.values()
-            for check in checks.values()
-            if check.get("status") == "warning"
-        )
-        error_count = sum(
-            1 for checks in all_checks.values()
-            for check in checks.values()
-            if check.get("status") == "error"
-        )
+        # Generate summary (single pass over every check)
+        tally = Counter()
+        total_checks = 0
+        for checks in all_checks.values():
+            total_checks += len(checks)
+            tally.update(check.get("status", "unknown") for check in checks.values())
+        ok_count = tally["ok"]
+        warning_count = tally["warning"]
+        error_count = tally["error"]
+        worst = max((_STATUS_SEVERITY.get(status, Status.OK) for status in tally), default=Status.OK)
         
         duration = time.time() - start_time
         
@@ -277,53 +507,81 @@ class HealthChecker:
             "warning_count": warning_count,
             "error_count": error_count,
             "duration": duration,
-            "overall_status": "ok" if error_count == 0 else "warning" if warning_count > 0 else "error"
+            "overall_status": worst.name.lower()
         }
         
-        self.logger.info(f"Health check completed in {duration:.2f}s - {ok_count} OK, {warning_count} warnings, {error_count} errors")
+        self.logger.info(
+            "Health check completed in %.2fs - %d OK, %d warnings, %d errors",
+            duration, ok_count, warning_count, error_count
+        )
         
-        return {
+        report = {
             "summary": summary,
             "checks": all_checks,
             "timestamp": time.time()
         }
+        if persist:
+            self._save_cached_report(report)
+        self._cache[report_key] = (report, self._result_ttl(error_count > 0))
+        self._cache_ts[report_key] = time.monotonic()
+        
+        return dict(report)
+        
+    def liveness(self):
+        """
+        Cheap liveness probe; runs no checks (safe to poll every second).
+        
+        Reports "ok" while the last full report is younger than cache_ttl,
+        otherwise "stale" (call readiness() to refresh it).
+        """
+        timestamps = [self._cache_ts[key] for key in ("all", "all_deep") if key in self._cache_ts]
+        if timestamps and time.monotonic() - max(timestamps) < self.cache_ttl:
+            return {"status": "ok"}
+        return {"status": "stale"}
+        
+    def readiness(self):
+        """
+        Readiness probe backed by the cached full report (poll about every 30 seconds).
+        
+        Returns the overall status and check counts of run_all_checks().
+        Polling never writes the report cache file.
+        """
+        summary = self.run_all_checks(persist=False)["summary"]
+        return {
+            "status": summary["overall_status"],
+            "ok_count": summary["ok_count"],
+            "warning_count": summary["warning_count"],
+            "error_count": summary["error_count"]
+        }
         
     def format_report(self, report):
         """Format health check report for display."""
-        lines = []
-        lines.append("=" * 60)
-        lines.append("VOICE ASSISTANT HEALTH CHECK REPORT")
-        lines.append("=" * 60)
+        return "\n".join(self._report_lines(report))
+        
+    def _report_lines(self, report):
+        """Yield the lines of a formatted health check report."""
+        yield _REPORT_RULE
+        yield "VOICE ASSISTANT HEALTH CHECK REPORT"
+        yield _REPORT_RULE
         
         summary = report["summary"]
-        lines.append(f"Overall Status: {summary['overall_status'].upper()}")
-        lines.append(f"Total Checks: {summary['total_checks']}")
-        lines.append(f"✅ OK: {summary['ok_count']}")
-        lines.append(f"⚠️  Warnings: {summary['warning_count']}")
-        lines.append(f"❌ Errors: {summary['error_count']}")
-        lines.append(f"Duration: {summary['duration']:.2f}s")
-        lines.append("")
+        yield f"Overall Status: {summary['overall_status'].upper()}"
+        yield f"Total Checks: {summary['total_checks']}"
+        yield f"✅ OK: {summary['ok_count']}"
+        yield f"⚠️  Warnings: {summary['warning_count']}"
+        yield f"❌ Errors: {summary['error_count']}"
+        yield f"Duration: {summary['duration']:.2f}s"
+        yield ""
         
         # Details by category
         for category, checks in report["checks"].items():
-            lines.append(f"📋 {category.upper().replace('_', ' ')}")
-            lines.append("-" * 40)
+            yield f"📋 {category.upper().replace('_', ' ')}"
+            yield _CATEGORY_RULE
             
             for check_name, check_result in checks.items():
-                status = check_result.get("status", "unknown")
+                icon = _STATUS_ICONS.get(check_result.get("status", "unknown"), "❓")
                 message = check_result.get("message", "No message")
-                
-                if status == "ok":
-                    icon = "✅"
-                elif status == "warning":
-                    icon = "⚠️"
-                elif status == "error":
-                    icon = "❌"
-                else:
-                    icon = "❓"
-                    
-                lines.append(f"  {icon} {check_name}: {message}")
-            lines.append("")
+                yield f"  {icon} {check_name}: {message}"
+            yield ""
             
-        lines.append("=" * 60)
-        return "\n".join(lines)
+        yield _REPORT_RULE
@@ -3,14 +3,43 @@ Performance Monitor Module
 Monitors system performance and resource usage for the voice assistant
 """
 
+import atexit
+import functools
 import logging
 import time
 import threading
 import psutil
+from collections import namedtuple
 from pathlib import Path
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+class AudioDevice(namedtuple('AudioDevice', 'index name max_input_channels max_output_channels default_sample_rate')):
+    """An enumerated audio device."""
+    __slots__ = ()
+    
+    def to_dict(self):
+        """Plain dict form (e.g. for JSON export)."""
+        return dict(self._asdict())
+
+# Last device enumeration shared by all monitors: (monotonic timestamp, devices)
+_device_cache = {}
+
+@functools.lru_cache(maxsize=1)
+def _shared_pyaudio():
+    """Create the process-wide PyAudio instance; PortAudio is initialized once and terminated at exit."""
+    import pyaudio
+    audio = pyaudio.PyAudio()
+    atexit.register(audio.terminate)
+    return audio
+
+# Seconds a cpu_freq() reading is reused by get_system_info
+CPU_FREQ_TTL = 60
+
+# Seconds stop_monitoring() waits for the monitor thread to exit
+STOP_TIMEOUT = 5
+
 class PerformanceMonitor:
     """Monitor system performance and resource usage."""
     
@@ -24,25 +53,51 @@ class PerformanceMonitor:
         self.interval = config.get('monitoring.interval', 30)  # seconds
         self.cpu_threshold = config.get('monitoring.cpu_threshold', 80)  # percent
         self.memory_threshold = config.get('monitoring.memory_threshold', 80)  # percent
+        self.disk_every = max(1, config.get('monitoring.disk_every', 10))  # updates between disk reads
+        self.track_network = config.get('monitoring.network_io', True)
         
         # State
         self.monitoring = False
         self.monitor_thread = None
-        self.stats = {
+        self._stop_event = threading.Event()
+        self._updates = 0
+        
+        # Read-only snapshot, replaced wholesale by each update so readers
+        # never see a half-written set of values and need no copy
+        self._stats_view = MappingProxyType({
             'cpu_usage': 0,
             'memory_usage': 0,
             'disk_usage': 0,
             'network_io': {'bytes_sent': 0, 'bytes_recv': 0},
             'process_memory': 0,
             'process_cpu': 0
+        })
+        
+        # Hardware facts that do not change while the process runs
+        self._static = {
+            'cpu_cores': psutil.cpu_count(),
+            'mem_total': psutil.virtual_memory().total
         }
         
+        # Persistent handle on this process; cpu_percent() measures against the
+        # previous call on the same handle, so it is primed here
+        self._proc = psutil.Process()
+        self._proc.cpu_percent(interval=None)
+        
+        # System-wide counterpart, so get_system_info() never has to sample
+        psutil.cpu_percent(interval=None)
+        
+        # CPU frequency changes only with the governor; re-read at most once a minute
+        self._cpu_freq = None
+        self._cpu_freq_ts = None
+        
     def start_monitoring(self):
         """Start performance monitoring."""
         if not self.enabled or self.monitoring:
             return
             
         self.monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
         self.logger.info("Performance monitoring started")
@@ -53,73 +108,105 @@ class PerformanceMonitor:
             return
             
         self.monitoring = False
+        self._stop_event.set()
         if self.monitor_thread:
-            self.monitor_thread.join(timeout=1)
+            self.monitor_thread.join(timeout=STOP_TIMEOUT)
+            if self.monitor_thread.is_alive():
+                self.logger.warning("Monitor thread still running %ss after stop was requested", STOP_TIMEOUT)
         self.logger.info("Performance monitoring stopped")
         
     def _monitor_loop(self):
         """Main monitoring loop."""
-        while self.monitoring:
+        while not self._stop_event.is_set():
             try:
                 self._update_stats()
                 self._check_thresholds()
-                time.sleep(self.interval)
             except Exception as e:
-                self.logger.error(f"Error in monitoring loop: {e}")
+                self.logger.error("Error in monitoring loop: %s", e)
+            # Returns as soon as stop_monitoring() sets the event
+            if self._stop_event.wait(self.interval):
+                break
                 
     def _update_stats(self):
         """Update system statistics."""
+        stats = dict(self._stats_view)
         try:
             # System stats
-            self.stats['cpu_usage'] = psutil.cpu_percent(interval=None)
+            stats['cpu_usage'] = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
-            self.stats['memory_usage'] = memory.percent
+            stats['memory_usage'] = memory.percent
             
-            disk = psutil.disk_usage('/')
-            self.stats['disk_usage'] = (disk.used / disk.total) * 100
+            # Disk fill changes slowly, so it is only re-read every few updates
+            if self._updates % self.disk_every == 0:
+                disk = psutil.disk_usage('/')
+                stats['disk_usage'] = (disk.used / disk.total) * 100
+            self._updates += 1
             
-            net_io = psutil.net_io_counters()
-            self.stats['network_io'] = {
-                'bytes_sent': net_io.bytes_sent,
-                'bytes_recv': net_io.bytes_recv
-            }
+            # No threshold uses network counters; they can be switched off
+            if self.track_network:
+                net_io = psutil.net_io_counters()
+                stats['network_io'] = {
+                    'bytes_sent': net_io.bytes_sent,
+                    'bytes_recv': net_io.bytes_recv
+                }
             
-            # Process stats
-            process = psutil.Process()
-            self.stats['process_memory'] = process.memory_percent()
-            self.stats['process_cpu'] = process.cpu_percent()
+            # Process stats (one batched /proc read)
+            with self._proc.oneshot():
+                stats['process_memory'] = self._proc.memory_percent()
+                stats['process_cpu'] = self._proc.cpu_percent(interval=None)
             
         except Exception as e:
-            self.logger.error(f"Error updating stats: {e}")
+            self.logger.error("Error updating stats: %s", e)
+        finally:
+            self._stats_view = MappingProxyType(stats)
             
     def _check_thresholds(self):
         """Check if any thresholds are exceeded."""
-        if self.stats['cpu_usage'] > self.cpu_threshold:
-            self.logger.warning(f"High CPU usage: {self.stats['cpu_usage']:.1f}%")
+        stats = self._stats_view
+        if stats['cpu_usage'] > self.cpu_threshold:
+            self.logger.warning("High CPU usage: %.1f%%", stats['cpu_usage'])
             
-        if self.stats['memory_usage'] > self.memory_threshold:
-            self.logger.warning(f"High memory usage: {self.stats['memory_usage']:.1f}%")
+        if stats['memory_usage'] > self.memory_threshold:
+            self.logger.warning("High memory usage: %.1f%%", stats['memory_usage'])
             
     def get_stats(self):
-        """Get current performance statistics."""
-        return self.stats.copy()
+        """Get current performance statistics (read-only view of the latest snapshot)."""
+        return self._stats_view
+        
+    def get_stats_copy(self):
+        """Get a mutable copy of the current performance statistics."""
+        return dict(self._stats_view)
+        
+    def _get_cpu_freq(self):
+        """Current CPU frequency, cached for CPU_FREQ_TTL seconds."""
+        now = time.monotonic()
+        if self._cpu_freq_ts is None or now - self._cpu_freq_ts >= CPU_FREQ_TTL:
+            self._cpu_freq = psutil.cpu_freq()
+            self._cpu_freq_ts = now
+        return self._cpu_freq
         
     def get_system_info(self):
         """Get detailed system information."""
         try:
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
+            cpu_freq = self._get_cpu_freq()
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
+            # Non-blocking: reuse the monitor loop's reading, or the usage
+            # since the previous call when the loop is not running
+            if self.monitoring:
+                cpu_usage = self._stats_view['cpu_usage']
+            else:
+                cpu_usage = psutil.cpu_percent(interval=None)
+            
             return {
                 'cpu': {
-                    'cores': cpu_count,
+                    'cores': self._static['cpu_cores'],
                     'frequency': cpu_freq.current if cpu_freq else 'Unknown',
-                    'usage': psutil.cpu_percent(interval=1)
+                    'usage': cpu_usage
                 },
                 'memory': {
-                    'total': memory.total,
+                    'total': self._static['mem_total'],
                     'available': memory.available,
                     'used': memory.used,
                     'percent': memory.percent
@@ -144,10 +231,12 @@ class AudioDeviceMonitor:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # Enumerated devices are reused for this many seconds
+        self.cache_ttl = config.get('audio_devices.cache_ttl', 60)
+        
         # Try to import pyaudio for device monitoring
         try:
-            import pyaudio
-            self.audio = pyaudio.PyAudio()
+            self.audio = _shared_pyaudio()
             self.available = True
         except ImportError:
             self.logger.warning("PyAudio not available - audio device monitoring disabled")
@@ -159,21 +248,31 @@ class AudioDeviceMonitor:
         if not self.available:
             return []
             
+        cached = _device_cache.get('devices')
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return list(cached[1])
+            
         devices = []
         try:
             for i in range(self.audio.get_device_count()):
                 device_info = self.audio.get_device_info_by_index(i)
-                devices.append({
-                    'index': i,
-                    'name': device_info['name'],
-                    'max_input_channels': device_info['maxInputChannels'],
-                    'max_output_channels': device_info['maxOutputChannels'],
-                    'default_sample_rate': device_info['defaultSampleRate']
-                })
+                devices.append(AudioDevice(
+                    i,
+                    device_info['name'],
+                    device_info['maxInputChannels'],
+                    device_info['maxOutputChannels'],
+                    device_info['defaultSampleRate']
+                ))
         except Exception as e:
             self.logger.error(f"Error getting audio devices: {e}")
+            return devices
             
-        return devices
+        _device_cache['devices'] = (time.monotonic(), devices)
+        return list(devices)
+        
+    def refresh_devices(self):
+        """Forget the cached device list (e.g. after a device is plugged in)."""
+        _device_cache.clear()
         
     def get_default_devices(self):
         """Get default input and output devices."""
@@ -240,7 +339,15 @@ class AudioDeviceMonitor:
             self.logger.error(f"Error testing device {device_index}: {e}")
             return False
             
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+        return False
+        
     def cleanup(self):
         """Cleanup audio resources."""
-        if self.audio:
-            self.audio.terminate()
+        # The PyAudio instance is shared and terminated at interpreter exit
+        self.audio = None
+        self.available = False
@@ -4,15 +4,21 @@ System Monitor for Lepida Voice Assistant
 Monitors system resources including CPU, memory, disk, and network usage
 """
 
+import copy
 import logging
-import psutil
+import math
 import time
 import threading
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
 class SystemMonitor:
     """
     System resource monitor for voice assistant.
@@ -33,11 +39,25 @@ class SystemMonitor:
         self.monitor_interval = self.config.get('monitor_interval', 5.0)  # seconds
         self.history_limit = self.config.get('history_limit', 100)  # number of readings
         
-        # Data storage
-        self.cpu_history = []
-        self.memory_history = []
-        self.disk_history = []
-        self.network_history = []
+        # numpy and psutil are only needed once a monitor exists
+        import numpy as np
+        import psutil
+        self._np = np
+        self._psutil = psutil
+        self.disk_refresh_every = max(1, self.config.get('disk_refresh_every', 12))  # readings
+        
+        # History ring buffers, one array per field; slot = reading number % history_limit
+        self._ts = np.zeros(self.history_limit, dtype=np.float64)  # unix epoch seconds
+        self._cpu = np.zeros(self.history_limit, dtype=np.float64)
+        self._memory = np.zeros(self.history_limit, dtype=np.float64)
+        self._disk = np.zeros(self.history_limit, dtype=np.float64)
+        self._net = np.zeros((self.history_limit, 2), dtype=np.int64)  # bytes sent, received
+        self._has_net = np.zeros(self.history_limit, dtype=bool)  # reading had network counters
+        self._idx = 0  # readings written so far
+        self._count = 0  # readings currently held
+        self._version = 0  # odd while a reading is being written; readers retry if odd or moved
+        self._write_lock = threading.Lock()
+        self._summary_cache = None  # (history version, summary) while monitoring
         
         # Monitoring state
         self.monitoring = False
@@ -47,6 +67,27 @@ class SystemMonitor:
         self.cpu_threshold = self.config.get('cpu_threshold', 80.0)  # %
         self.memory_threshold = self.config.get('memory_threshold', 85.0)  # %
         self.disk_threshold = self.config.get('disk_threshold', 90.0)  # %
+        self._thresholds = np.array(
+            [self.cpu_threshold, self.memory_threshold, self.disk_threshold], dtype=np.float64
+        )
+        self._threshold_labels = ("CPU", "memory", "disk")
+        self._alert_templates = tuple(
+            f"System Alert: High {label} usage: %.1f%%" for label in self._threshold_labels
+        )
+        self._health_penalties = np.array([30, 25, 25])
+        
+        # cpu_percent(interval=None) reports usage since the previous call; prime it
+        psutil.cpu_percent(interval=None)
+        
+        # Facts that do not change while the process runs
+        self._cpu_count = psutil.cpu_count()
+        self._boot_time = datetime.fromtimestamp(psutil.boot_time())
+        freq = psutil.cpu_freq()
+        self._freq_min, self._freq_max = (freq.min, freq.max) if freq else (None, None)
+        
+        # Disk usage moves slowly; statvfs is only repeated every disk_refresh_every readings
+        self._disk_tick = 0
+        self._disk_cache = None
         
         self.logger.info("SystemMonitor initialized")
     
@@ -55,37 +96,41 @@ class SystemMonitor:
         Get current system statistics.
         
         Returns:
-            Dictionary containing current system stats
+            Dictionary containing current system stats ('timestamp' is unix epoch seconds)
         """
         try:
+            now = time.time()
+            
             # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
+            cpu_percent = self._psutil.cpu_percent(interval=None)  # non-blocking, since last call
+            cpu_freq = self._psutil.cpu_freq() if self._freq_max is not None else None
             
             # Memory usage
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            memory = self._psutil.virtual_memory()
+            swap = self._psutil.swap_memory()
             
             # Disk usage
-            disk = psutil.disk_usage('/')
+            if self._disk_cache is None or self._disk_tick % self.disk_refresh_every == 0:
+                self._disk_cache = self._psutil.disk_usage('/')
+            self._disk_tick += 1
+            disk = self._disk_cache
             
             # Network stats
-            network = psutil.net_io_counters()
+            network = self._psutil.net_io_counters()
             
             # System info
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
-            uptime = datetime.now() - boot_time
+            boot_time = self._boot_time
+            uptime = datetime.fromtimestamp(now) - boot_time
             
             stats = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now,  # unix epoch seconds
                 'cpu': {
                     'percent': cpu_percent,
-                    'count': cpu_count,
+                    'count': self._cpu_count,
                     'frequency': {
                         'current': cpu_freq.current if cpu_freq else None,
-                        'min': cpu_freq.min if cpu_freq else None,
-                        'max': cpu_freq.max if cpu_freq else None
+                        'min': self._freq_min,
+                        'max': self._freq_max
                     }
                 },
                 'memory': {
@@ -126,7 +171,7 @@ class SystemMonitor:
             self.logger.error(f"Error getting system stats: {e}")
             return {
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': time.time()
             }
     
     def start_monitoring(self):
@@ -167,55 +212,63 @@ class SystemMonitor:
                 time.sleep(self.monitor_interval)
     
     def _add_to_history(self, stats: Dict[str, Any]):
-        """Add stats to history and maintain size limit."""
-        # Add to histories
-        self.cpu_history.append({
-            'timestamp': stats['timestamp'],
-            'percent': stats['cpu']['percent']
-        })
-        
-        self.memory_history.append({
-            'timestamp': stats['timestamp'],
-            'percent': stats['memory']['percent']
-        })
-        
-        self.disk_history.append({
-            'timestamp': stats['timestamp'],
-            'percent': stats['disk']['percent']
-        })
-        
-        if 'network' in stats:
-            self.network_history.append({
-                'timestamp': stats['timestamp'],
-                'bytes_sent': stats['network']['bytes_sent'],
-                'bytes_recv': stats['network']['bytes_recv']
-            })
+        """Add stats to history, overwriting the oldest reading once the buffer is full."""
+        with self._write_lock:
+            self._version += 1  # odd: write in progress
+            slot = self._idx % self.history_limit
+            self._ts[slot] = stats['timestamp']
+            self._cpu[slot] = stats['cpu']['percent']
+            self._memory[slot] = stats['memory']['percent']
+            self._disk[slot] = stats['disk']['percent']
+            if 'network' in stats:
+                self._net[slot] = (stats['network']['bytes_sent'], stats['network']['bytes_recv'])
+                self._has_net[slot] = True
+            else:
+                self._net[slot] = 0
+                self._has_net[slot] = False
+            
+            # Publish the reading only after all fields are written
+            self._idx += 1
+            self._count = min(self._count + 1, self.history_limit)
+            self._version += 1  # even again: reading complete
+    
+    def _history_slots(self, limit: Optional[int] = None) -> 'np.ndarray':
+        """Ring buffer slots of the last `limit` readings (all held readings if None), oldest first."""
+        end = self._idx
+        count = min(self._count, limit) if limit else self._count
+        return self._np.arange(end - count, end) % self.history_limit
+    
+    def _snapshot(self, fields: List['np.ndarray'], limit: Optional[int] = None) -> List['np.ndarray']:
+        """
+        Copy the last `limit` readings of each field without blocking the writer.
         
-        # Trim histories to maintain size limit
-        self.cpu_history = self.cpu_history[-self.history_limit:]
-        self.memory_history = self.memory_history[-self.history_limit:]
-        self.disk_history = self.disk_history[-self.history_limit:]
-        self.network_history = self.network_history[-self.history_limit:]
+        The copy is retried if the monitor thread was writing a reading when it
+        started (odd version) or wrote one meanwhile (version moved).
+        """
+        while True:
+            version = self._version
+            if version & 1:
+                time.sleep(0)  # let the writer finish
+                continue
+            slots = self._history_slots(limit)
+            copies = [field[slots] for field in fields]  # fancy indexing copies
+            if self._version == version:
+                return copies
+    
+    def _usage_vector(self, stats: Dict[str, Any]) -> 'np.ndarray':
+        """CPU, memory and disk usage percentages, in threshold order."""
+        return self._np.array(
+            [stats['cpu']['percent'], stats['memory']['percent'], stats['disk']['percent']],
+            dtype=self._np.float64
+        )
     
     def _check_alerts(self, stats: Dict[str, Any]):
         """Check for system alerts based on thresholds."""
-        alerts = []
-        
-        # Check CPU
-        if stats['cpu']['percent'] > self.cpu_threshold:
-            alerts.append(f"High CPU usage: {stats['cpu']['percent']:.1f}%")
-        
-        # Check Memory
-        if stats['memory']['percent'] > self.memory_threshold:
-            alerts.append(f"High memory usage: {stats['memory']['percent']:.1f}%")
-        
-        # Check Disk
-        if stats['disk']['percent'] > self.disk_threshold:
-            alerts.append(f"High disk usage: {stats['disk']['percent']:.1f}%")
+        current = self._usage_vector(stats)
         
         # Log alerts
-        for alert in alerts:
-            self.logger.warning(f"System Alert: {alert}")
+        for i in (current > self._thresholds).nonzero()[0]:
+            self.logger.warning(self._alert_templates[i], current[i])
     
     def get_history(self, metric: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -228,26 +281,52 @@ class SystemMonitor:
         Returns:
             List of historical data points
         """
-        history_map = {
-            'cpu': self.cpu_history,
-            'memory': self.memory_history,
-            'disk': self.disk_history,
-            'network': self.network_history
+        percent_history = {
+            'cpu': self._cpu,
+            'memory': self._memory,
+            'disk': self._disk
         }
+        if metric != 'network' and metric not in percent_history:
+            return []
         
-        history = history_map.get(metric, [])
+        # Entries are built only for the readings requested
+        if metric == 'network':
+            # Readings without network counters are not part of the network history
+            ts_values, values, has_net = self._snapshot([self._ts, self._net, self._has_net])
+            ts_values, values = ts_values[has_net], values[has_net]
+            if limit:
+                ts_values, values = ts_values[-limit:], values[-limit:]
+        else:
+            ts_values, values = self._snapshot([self._ts, percent_history[metric]], limit)
+        timestamps = [datetime.fromtimestamp(ts).isoformat() for ts in ts_values.tolist()]
         
-        if limit:
-            return history[-limit:]
-        return history
+        if metric == 'network':
+            return [
+                {'timestamp': ts, 'bytes_sent': sent, 'bytes_recv': recv}
+                for ts, (sent, recv) in zip(timestamps, values.tolist())
+            ]
+        return [
+            {'timestamp': ts, 'percent': percent}
+            for ts, percent in zip(timestamps, values.tolist())
+        ]
     
-    def get_summary(self) -> Dict[str, Any]:
+    def get_summary(self, force: bool = False) -> Dict[str, Any]:
         """
         Get summary of system status.
         
+        While monitoring, the summary is reused until the next reading is recorded.
+        
+        Args:
+            force: Take a fresh sample even if a cached summary is available
+            
         Returns:
             Summary dictionary
         """
+        version = self._version
+        cached = self._summary_cache
+        if not force and self.monitoring and cached is not None and cached[0] == version:
+            return copy.deepcopy(cached[1])  # callers may modify what they get
+        
         current_stats = self.get_current_stats()
         
         if 'error' in current_stats:
@@ -258,34 +337,22 @@ class SystemMonitor:
         memory_avg = None
         disk_current = current_stats['disk']['percent']
         
-        if self.cpu_history:
-            cpu_avg = sum(h['percent'] for h in self.cpu_history[-10:]) / len(self.cpu_history[-10:])
-        
-        if self.memory_history:
-            memory_avg = sum(h['percent'] for h in self.memory_history[-10:]) / len(self.memory_history[-10:])
+        if self._count:
+            cpu_recent, memory_recent = self._snapshot([self._cpu, self._memory], 10)
+            cpu_avg = float(cpu_recent.mean())
+            memory_avg = float(memory_recent.mean())
         
         # Determine system health
-        health_score = 100
-        warnings = []
-        
-        if current_stats['cpu']['percent'] > self.cpu_threshold:
-            health_score -= 30
-            warnings.append("High CPU usage")
-        
-        if current_stats['memory']['percent'] > self.memory_threshold:
-            health_score -= 25
-            warnings.append("High memory usage")
-        
-        if disk_current > self.disk_threshold:
-            health_score -= 25
-            warnings.append("High disk usage")
+        exceeded = self._usage_vector(current_stats) > self._thresholds
+        health_score = 100 - int(self._health_penalties[exceeded].sum())
+        warnings = [f"High {self._threshold_labels[i]} usage" for i in exceeded.nonzero()[0]]
         
         health_status = 'excellent' if health_score >= 90 else \
                        'good' if health_score >= 70 else \
                        'fair' if health_score >= 50 else 'poor'
         
-        return {
-            'timestamp': current_stats['timestamp'],
+        summary = {
+            'timestamp': datetime.fromtimestamp(current_stats['timestamp']).isoformat(),
             'health': {
                 'score': max(0, health_score),
                 'status': health_status,
@@ -304,9 +371,11 @@ class SystemMonitor:
             'monitoring': {
                 'active': self.monitoring,
                 'interval': self.monitor_interval,
-                'history_size': len(self.cpu_history)
+                'history_size': self._count
             }
         }
+        self._summary_cache = (version, copy.deepcopy(summary))
+        return summary
     
     def format_bytes(self, bytes_value: float) -> str:
         """
@@ -318,11 +387,11 @@ class SystemMonitor:
         Returns:
             Formatted string
         """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_value < 1024.0:
-                return f"{bytes_value:.1f} {unit}"
-            bytes_value /= 1024.0
-        return f"{bytes_value:.1f} PB"
+        if bytes_value < 1024:
+            return f"{bytes_value:.1f} B"
+        # Each unit is 2**10 of the previous one
+        idx = min(int(math.log2(bytes_value)) // 10, len(_BYTE_UNITS) - 1)
+        return f"{bytes_value / (1 << (idx * 10)):.1f} {_BYTE_UNITS[idx]}"
 
 
 def main():
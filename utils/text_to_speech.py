@@ -3,12 +3,32 @@ Text-to-Speech utility module
 Handles text-to-speech conversion with plugin support
 """
 
+import functools
 import importlib
+import importlib.util
 import logging
 from pathlib import Path
-from helper.numberToText import NumberToText
 import re
 
+# Numbers spoken as words: grouped thousands (1.000 / 1,000) or plain digit runs
+_NUMBER_RE = re.compile(r'\b\d{1,3}(?:[.,]\d{3})*\b|\b\d+\b')
+_has_digit = re.compile(r'\d').search
+
+@functools.lru_cache(maxsize=1024)
+def _num_to_words(number):
+    """Indonesian words for an integer (memoized; utterances repeat small numbers)."""
+    # Imported on first use so loading this module does not pull in the converter
+    from helper.numberToText import NumberToText
+    return NumberToText.convert(number)
+
+def _number_to_words(match):
+    """Replace a matched number with its Indonesian words."""
+    try:
+        number = int(match.group())
+        return _num_to_words(number)
+    except (ValueError, OverflowError):
+        return match.group()
+
 class TextToSpeech:
     """Text-to-Speech wrapper with plugin support."""
     
@@ -28,6 +48,29 @@ class TextToSpeech:
         if not self.tts_engine:
             self.logger.error("Failed to load any TTS engine")
             raise Exception("No TTS engine could be loaded")
+        
+        # Resolve the engine entry points once instead of on every call
+        self._engine_run = getattr(self.tts_engine, 'run', None)
+        self._engine_get_voices = getattr(self.tts_engine, 'get_voices', None)
+        self._engine_set_voice = getattr(self.tts_engine, 'set_voice', None)
+    
+    @classmethod
+    def probe(cls, config):
+        """
+        Check that a TTS engine plugin can be found, without importing it.
+        
+        Returns:
+            tuple: (available, message)
+        """
+        primary = config.get('tts.primary_engine', 'mms_tts')
+        engines = [primary] + [e for e in config.get('tts.fallback_engines', []) if e != primary]
+        for engine in engines:
+            try:
+                if importlib.util.find_spec(f'plugins.tts_{engine}') is not None:
+                    return True, f"TTS engine plugin found: {engine}"
+            except (ImportError, ValueError):
+                continue
+        return False, f"No TTS engine plugin found (tried: {', '.join(engines)})"
     
     def _load_tts_engine(self, engine_name):
         """Load a TTS engine plugin."""
@@ -54,16 +97,8 @@ class TextToSpeech:
     
     def _preprocess_text(self, text):
         """Preprocess text for better TTS pronunciation."""
-        # Convert numbers to words for better pronunciation
-        def number_to_words(match):
-            try:
-                number = int(match.group())
-                return NumberToText.convert(number)
-            except (ValueError, OverflowError):
-                return match.group()
-        
-        # Find all numbers and replace with words
-        processed_text = re.sub(r'\b\d{1,3}(?:[.,]\d{3})*\b|\b\d+\b', number_to_words, text)
+        # Find all numbers and replace with words for better pronunciation
+        processed_text = _NUMBER_RE.sub(_number_to_words, text)
         
         # Additional text processing can be added here
         # - Remove special characters
@@ -88,17 +123,18 @@ class TextToSpeech:
         if lang is None:
             lang = self.language
         
-        # Preprocess text
+        # Preprocess text (only numbers are rewritten, so digit-free text is used as-is)
         original_text = text
-        processed_text = self._preprocess_text(text)
+        processed_text = self._preprocess_text(text) if _has_digit(text) else text
         
-        if original_text != processed_text:
-            self.logger.debug(f"Text preprocessing: '{original_text}' -> '{processed_text}'")
+        if processed_text is not original_text and self.logger.isEnabledFor(logging.DEBUG) \
+                and original_text != processed_text:
+            self.logger.debug("Text preprocessing: '%s' -> '%s'", original_text, processed_text)
         
         try:
             # Call the TTS engine
-            if hasattr(self.tts_engine, 'run'):
-                self.tts_engine.run(processed_text, lang, output_file)
+            if self._engine_run is not None:
+                self._engine_run(processed_text, lang, output_file)
             else:
                 self.logger.error("TTS engine does not have 'run' method")
                 
@@ -108,12 +144,12 @@ class TextToSpeech:
     
     def get_available_voices(self):
         """Get list of available voices from the TTS engine."""
-        if hasattr(self.tts_engine, 'get_voices'):
-            return self.tts_engine.get_voices()
+        if self._engine_get_voices is not None:
+            return self._engine_get_voices()
         return []
     
     def set_voice(self, voice_id):
         """Set the voice for TTS output."""
-        if hasattr(self.tts_engine, 'set_voice'):
-            return self.tts_engine.set_voice(voice_id)
+        if self._engine_set_voice is not None:
+            return self._engine_set_voice(voice_id)
         return False
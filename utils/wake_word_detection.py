@@ -3,13 +3,87 @@ Wake Word Detection System
 Manages wake word detection and activation
 """
 
+import functools
+import importlib
+import importlib.util
 import logging
+import queue
+import os
+import re
+import tempfile
 import threading
 import time
+import wave
+from collections import OrderedDict
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Wake word engine name -> plugin module
+ENGINE_PLUGINS = {
+    'porcupine': 'plugins.wakeword_porcupine',
+    'onnx': 'plugins.wakeword_onnx',
+}
+
+# Initialized engine handles kept per (keywords, sensitivity)
+ENGINE_CACHE_SIZE = 4
+
+# Seconds to wait for further config changes before restarting the engine
+RESTART_DEBOUNCE = 0.05
+
+# Detections waiting for the callback worker; further ones are dropped
+DETECTION_QUEUE_SIZE = 4
+
+# Queued by stop_detection() to end the callback worker, and how long to wait for it
+_STOP_DISPATCH = object()
+DISPATCH_STOP_TIMEOUT = 2.0
+
+# Wake phrases and STT output are matched word by word
+_tokenize = re.compile(r'\w+').findall
+
+# Energy gate for the STT fallback: 30 ms frames of 16 kHz int16 audio
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 480
+DEFAULT_ENERGY_THRESHOLD = 1e5  # mean square, roughly RMS 316
+RING_FRAMES = 64  # audio held between listen loop passes (~1.9 s)
+UTTERANCE_FRAMES = 100  # longest voiced stretch sent to STT at once (3 s)
+UTTERANCE_END_FRAMES = 10  # silent frames that close an utterance (300 ms)
+LISTEN_STOP_TIMEOUT = 2.0  # seconds to wait for the listen loop (it may be inside STT)
+
+@functools.lru_cache(maxsize=None)
+def _optional_import(name):
+    """
+    Import an optional accelerator on first use.
+    
+    pyahocorasick and numba are only imported by the code that uses them, so
+    loading this module stays cheap. Returns None when the package is missing.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+def _frame_energy_loop(pcm):
+    """Mean square of an int16 PCM frame, in one pass (compiled with numba)."""
+    total = 0.0
+    for i in range(pcm.shape[0]):
+        sample = float(pcm[i])
+        total += sample * sample
+    return total / max(pcm.shape[0], 1)
+
+def _frame_energy_numpy(pcm):
+    """Mean square of an int16 PCM frame (a NumPy array)."""
+    samples = pcm.astype('float64')
+    return float(samples.dot(samples)) / max(samples.shape[0], 1)
+
+@functools.lru_cache(maxsize=None)
+def _frame_energy_function():
+    """The energy gate implementation: JIT-compiled when numba is installed."""
+    numba = _optional_import('numba')
+    if numba is None:
+        return _frame_energy_numpy
+    return numba.njit(cache=True, fastmath=True)(_frame_energy_loop)
+
 class WakeWordDetector:
     """Wake word detection manager."""
     
@@ -33,22 +107,58 @@ class WakeWordDetector:
         self.is_listening = False
         self.detection_callback = None
         self.engine = None
+        self._engine_cache = OrderedDict()  # (keywords, sensitivity) -> handle, LRU order
+        self._config_lock = threading.Lock()
+        self._restart_timer = None
+        self._index_keywords()
+        
+        # Callbacks run on a worker thread so the engine's audio thread never blocks;
+        # each worker gets its own queue, so a stop marker only reaches its worker
+        self._detections = queue.Queue(maxsize=DETECTION_QUEUE_SIZE)
+        self._dispatch_thread = None
         
         # Load detection engine
         if self.enabled:
             self._load_engine()
     
+    @classmethod
+    def probe(cls, config):
+        """
+        Check that the wake word engine plugin can be found, without importing it.
+        
+        Returns:
+            tuple: (available, message)
+        """
+        if not config.get('wakeword.enabled', True):
+            return False, "Wake word detection disabled"
+        
+        engine = config.get('wakeword.primary_engine', 'porcupine')
+        if engine not in ENGINE_PLUGINS:
+            return False, f"Unknown wake word engine: {engine}"
+        
+        try:
+            found = importlib.util.find_spec(ENGINE_PLUGINS[engine]) is not None
+        except (ImportError, ValueError):
+            found = False
+        if found:
+            return True, "Wake word detection available"
+        return False, "Wake word engine plugin not found - detection disabled"
+    
     def _load_engine(self):
         """Load wake word detection engine."""
         try:
-            if self.primary_engine == 'porcupine':
-                from plugins.wakeword_porcupine import initialize, start_listening, stop_listening
+            if self.primary_engine in ENGINE_PLUGINS:
+                plugin = importlib.import_module(ENGINE_PLUGINS[self.primary_engine])
                 self.engine = {
-                    'initialize': initialize,
-                    'start_listening': start_listening,
-                    'stop_listening': stop_listening
+                    'initialize': plugin.initialize,
+                    'start_listening': plugin.start_listening,
+                    'stop_listening': plugin.stop_listening
                 }
-                self.logger.info("Loaded Porcupine wake word engine")
+                # Handle reuse is optional; without it the engine is reinitialized on every start
+                for name in ('retain_handle', 'use_handle', 'release_handle'):
+                    if hasattr(plugin, name):
+                        self.engine[name] = getattr(plugin, name)
+                self.logger.info(f"Loaded {self.primary_engine} wake word engine")
             else:
                 self.logger.warning(f"Unknown wake word engine: {self.primary_engine}")
                 
@@ -69,13 +179,11 @@ class WakeWordDetector:
         
         try:
             self.detection_callback = callback
+            self._ensure_dispatcher()
             
-            # Initialize engine
+            # Initialize engine (or reactivate a handle built for the same settings)
             if 'initialize' in self.engine:
-                self.engine['initialize'](
-                    keywords=self.keywords,
-                    sensitivity=self.sensitivity
-                )
+                self._get_or_init(self.keywords, self.sensitivity)
             
             # Start listening
             if 'start_listening' in self.engine:
@@ -89,8 +197,37 @@ class WakeWordDetector:
             self.logger.error(f"Failed to start wake word detection: {e}")
             return False
     
+    def _get_or_init(self, keywords, sensitivity):
+        """
+        Return an engine handle for these settings, initializing only on a cache miss.
+        
+        Cached handles are retained by this detector, so the plugin's cleanup()
+        cannot free them; they are released only when evicted.
+        """
+        can_reuse = all(name in self.engine for name in ('retain_handle', 'use_handle', 'release_handle'))
+        key = (tuple(keywords), round(sensitivity, 3))
+        
+        if can_reuse and key in self._engine_cache:
+            self._engine_cache.move_to_end(key)
+            handle = self._engine_cache[key]
+            self.engine['use_handle'](handle)
+            return handle
+        
+        handle = self.engine['initialize'](keywords=list(keywords), sensitivity=sensitivity)
+        if can_reuse:
+            self._engine_cache[key] = self.engine['retain_handle'](handle)
+            while len(self._engine_cache) > ENGINE_CACHE_SIZE:
+                _, evicted = self._engine_cache.popitem(last=False)
+                self.engine['release_handle'](evicted)
+        return handle
+    
     def stop_detection(self):
         """Stop wake word detection."""
+        with self._config_lock:
+            if self._restart_timer is not None:
+                self._restart_timer.cancel()
+                self._restart_timer = None
+        
         if not self.is_listening or not self.engine:
             return
         
@@ -99,54 +236,152 @@ class WakeWordDetector:
                 self.engine['stop_listening']()
             
             self.is_listening = False
+            self._drain_detections()
+            self._stop_dispatcher()
             self.logger.info("Wake word detection stopped")
             
         except Exception as e:
             self.logger.error(f"Failed to stop wake word detection: {e}")
     
     def _on_wake_word_detected(self, keyword_index):
-        """Handle wake word detection."""
+        """Handle wake word detection (called on the engine's audio thread, so only enqueue)."""
+        keyword = "unknown"
         try:
             keyword = self.keywords[keyword_index] if keyword_index < len(self.keywords) else "unknown"
             self.logger.info(f"Wake word detected: {keyword}")
-            
-            if self.detection_callback:
-                self.detection_callback(keyword, keyword_index)
-                
+            self._detections.put_nowait((keyword, keyword_index, time.monotonic()))
+        except queue.Full:
+            self.logger.warning(f"Wake word callback busy, dropping detection: {keyword}")
         except Exception as e:
             self.logger.error(f"Error handling wake word detection: {e}")
     
+    def _ensure_dispatcher(self):
+        """Start a callback worker, with a fresh queue, if none is running."""
+        if self._dispatch_thread is None or not self._dispatch_thread.is_alive():
+            self._detections = queue.Queue(maxsize=DETECTION_QUEUE_SIZE)
+            self._dispatch_thread = threading.Thread(
+                target=self._dispatch_loop, args=(self._detections,),
+                name="wakeword-cb", daemon=True
+            )
+            self._dispatch_thread.start()
+    
+    def _stop_dispatcher(self):
+        """Queue the stop marker for the callback worker and wait briefly for it to exit."""
+        thread = self._dispatch_thread
+        # A callback that stops detection keeps its own worker for the next start
+        if thread is None or thread is threading.current_thread():
+            return
+        
+        # The worker is detached even if it is still inside a callback: the
+        # marker sits in its own queue, and the next start gets a new worker
+        detections = self._detections
+        self._dispatch_thread = None
+        while True:
+            try:
+                detections.put_nowait(_STOP_DISPATCH)
+                break
+            except queue.Full:
+                # Detections queued after the drain; the stop wins
+                try:
+                    detections.get_nowait()
+                except queue.Empty:
+                    pass
+        
+        thread.join(timeout=DISPATCH_STOP_TIMEOUT)
+        if thread.is_alive():
+            self.logger.warning("Wake word callback still running after stop; its worker exits when it returns")
+    
+    def _dispatch_loop(self, detections):
+        """Run detection callbacks from this worker's queue until _STOP_DISPATCH."""
+        while True:
+            item = detections.get()
+            if item is _STOP_DISPATCH:
+                break
+            keyword, keyword_index, detected_at = item
+            self.logger.debug(f"Dispatching wake word after {time.monotonic() - detected_at:.3f}s")
+            try:
+                if self.detection_callback:
+                    self.detection_callback(keyword, keyword_index)
+            except Exception as e:
+                self.logger.error(f"Error handling wake word detection: {e}")
+    
+    def _drain_detections(self):
+        """Discard detections that have not been dispatched yet."""
+        try:
+            while True:
+                self._detections.get_nowait()
+        except queue.Empty:
+            pass
+    
     def add_keyword(self, keyword):
         """Add a new wake word keyword."""
-        if keyword not in self.keywords:
+        with self._config_lock:
+            if keyword in self._keyword_set:
+                return
             self.keywords.append(keyword)
-            self.logger.info(f"Added wake word: {keyword}")
-            
-            # Restart detection if currently active
-            if self.is_listening:
-                self.stop_detection()
-                self.start_detection(self.detection_callback)
+            self._index_keywords()
+        self.logger.info(f"Added wake word: {keyword}")
+        self._schedule_restart()
     
     def remove_keyword(self, keyword):
         """Remove a wake word keyword."""
-        if keyword in self.keywords:
+        with self._config_lock:
+            if keyword not in self._keyword_set:
+                return
             self.keywords.remove(keyword)
-            self.logger.info(f"Removed wake word: {keyword}")
-            
-            # Restart detection if currently active
-            if self.is_listening:
-                self.stop_detection()
-                self.start_detection(self.detection_callback)
+            self._index_keywords()
+        self.logger.info(f"Removed wake word: {keyword}")
+        self._schedule_restart()
     
     def set_sensitivity(self, sensitivity):
         """Set wake word detection sensitivity."""
         self.sensitivity = max(0.0, min(1.0, sensitivity))
         self.logger.info(f"Wake word sensitivity set to: {self.sensitivity}")
+        self._schedule_restart()
+    
+    def update_config(self, keywords=None, sensitivity=None):
+        """Change keywords and/or sensitivity together with a single engine restart."""
+        with self._config_lock:
+            if keywords is not None:
+                self.keywords = list(keywords)
+                self._index_keywords()
+            if sensitivity is not None:
+                self.sensitivity = max(0.0, min(1.0, sensitivity))
+        self.logger.info(f"Wake word config updated: keywords={self.keywords}, sensitivity={self.sensitivity}")
+        self._schedule_restart()
+    
+    def _index_keywords(self):
+        """Rebuild the keyword lookups after self.keywords changes (caller holds _config_lock)."""
+        self._keyword_index = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self._keyword_set = frozenset(self._keyword_index)
+    
+    def get_keyword_index(self, keyword):
+        """Index of a wake word as reported by the engine, or None if it is not configured."""
+        return self._keyword_index.get(keyword)
+    
+    def _schedule_restart(self):
+        """
+        Restart detection shortly, if active.
         
-        # Restart detection if currently active
+        Changes made within RESTART_DEBOUNCE of each other share one restart.
+        """
+        if not self.is_listening:
+            return
+        with self._config_lock:
+            if self._restart_timer is not None:
+                self._restart_timer.cancel()
+            self._restart_timer = threading.Timer(RESTART_DEBOUNCE, self._do_restart)
+            self._restart_timer.daemon = True
+            self._restart_timer.start()
+    
+    def _do_restart(self):
+        """Apply pending config changes by restarting the engine."""
+        with self._config_lock:
+            self._restart_timer = None
         if self.is_listening:
+            callback = self.detection_callback
             self.stop_detection()
-            self.start_detection(self.detection_callback)
+            self.start_detection(callback)
     
     def get_status(self):
         """Get current status of wake word detection."""
@@ -161,60 +396,355 @@ class WakeWordDetector:
 class SimpleWakeWordDetector:
     """Simple fallback wake word detector using basic audio analysis."""
     
-    def __init__(self, keywords=None, threshold=0.8):
+    def __init__(self, keywords=None, threshold=0.8, energy_threshold=DEFAULT_ENERGY_THRESHOLD,
+                 poll_interval=0.1, transcriber=None):
         """
         Initialize simple wake word detector.
         
         Args:
             keywords (list): List of wake words
             threshold (float): Detection threshold
+            energy_threshold (float): Minimum frame mean square worth sending to STT
+            poll_interval (float): Seconds between listen loop iterations
+            transcriber (function): Takes a WAV file path and returns its text,
+                e.g. AudioTranscription(config).transcribe_audio
         """
         self.keywords = keywords or ['hey assistant', 'halo asisten']
         self.threshold = threshold
+        self.energy_threshold = energy_threshold
+        self.poll_interval = poll_interval
+        self.transcriber = transcriber
         self.is_listening = False
         self.callback = None
         self.logger = logging.getLogger(__name__)
+        self._build_matcher()
+        
+        # Listen loop of the current session and the event that stops it; each
+        # session gets a new event, so a stale loop can never be restarted
+        self._listen_thread = None
+        self._stop_event = threading.Event()
+        
+        # Audio ring buffer, allocated on first start: one contiguous int16 array and
+        # monotonic sample counters. feed_audio() is the only writer and only moves
+        # _write_idx; the listen loop is the only reader and only moves _read_idx.
+        self._ring = None
+        self._frombuffer = None
+        self._write_idx = 0
+        self._read_idx = 0
+        
+        # Voiced frames collected for the next STT call, and the microphone stream
+        self._utterance = None
+        self._audio_interface = None
+        self._stream = None
+        self._stream = None
+    
+    def _build_matcher(self):
+        """Compile the keywords so recognised text is scanned once for all of them."""
+        self._automaton = None
+        phrases = [
+            (idx, tuple(_tokenize(keyword.lower())), keyword)
+            for idx, keyword in enumerate(self.keywords)
+        ]
+        phrases = [phrase for phrase in phrases if phrase[1]]
+        
+        ahocorasick = _optional_import('ahocorasick') if phrases else None
+        if ahocorasick is not None:
+            # Space-padded phrases over space-joined tokens only match whole words
+            automaton = ahocorasick.Automaton()
+            for idx, tokens, keyword in phrases:
+                automaton.add_word(f" {' '.join(tokens)} ", (idx, keyword))
+            automaton.make_automaton()
+            self._automaton = automaton
+            return
+        
+        # Token trie with suffix links: node 0 is the root; per node, its children,
+        # the node for its longest proper suffix, and the phrase ending there
+        # (own or inherited through the suffix link)
+        children = [{}]
+        terminal = [None]
+        for idx, tokens, keyword in phrases:
+            node = 0
+            for token in tokens:
+                if token not in children[node]:
+                    children.append({})
+                    terminal.append(None)
+                    children[node][token] = len(children) - 1
+                node = children[node][token]
+            if terminal[node] is None:
+                terminal[node] = (idx, keyword)
+        
+        # Breadth-first, so every suffix link points at an already finished, shallower node
+        suffix = [0] * len(children)  # depth-1 nodes link to the root
+        level = list(children[0].values())
+        while level:
+            next_level = []
+            for node in level:
+                for token, child in children[node].items():
+                    link = suffix[node]
+                    while link and token not in children[link]:
+                        link = suffix[link]
+                    suffix[child] = children[link].get(token, 0)
+                    if terminal[child] is None:
+                        terminal[child] = terminal[suffix[child]]
+                    next_level.append(child)
+            level = next_level
+        
+        self._trie_children = children
+        self._trie_suffix = suffix
+        self._trie_terminal = terminal
+    
+    def add_keyword(self, keyword):
+        """Add a new wake word keyword."""
+        if keyword not in self.keywords:
+            self.keywords.append(keyword)
+            self._build_matcher()
     
-    def start_listening(self, callback=None):
-        """Start simple wake word detection."""
+    def remove_keyword(self, keyword):
+        """Remove a wake word keyword."""
+        if keyword in self.keywords:
+            self.keywords.remove(keyword)
+            self._build_matcher()
+    
+    def match_keyword(self, text):
+        """
+        Find a wake word in recognised text.
+        
+        Returns:
+            tuple: (keyword_index, keyword) of the first match, or None
+        """
+        tokens = _tokenize(text.lower())
+        if self._automaton is not None:
+            for _end, found in self._automaton.iter(f" {' '.join(tokens)} "):
+                return found
+            return None
+        
+        # One left-to-right pass; on a mismatch fall back along suffix links
+        children, suffix, terminal = self._trie_children, self._trie_suffix, self._trie_terminal
+        node = 0
+        for token in tokens:
+            while node and token not in children[node]:
+                node = suffix[node]
+            node = children[node].get(token, 0)
+            if terminal[node] is not None:
+                return terminal[node]
+        return None
+    
+    def has_voice(self, pcm):
+        """Cheap pre-gate: True if an int16 frame is loud enough to be worth transcribing."""
+        return _frame_energy_function()(pcm) > self.energy_threshold
+    
+    def process_text(self, text):
+        """Check STT output for a wake word and call the callback on a match."""
+        found = self.match_keyword(text)
+        if found is None:
+            return False
+        idx, keyword = found
+        self.logger.info(f"Wake word detected: {keyword}")
+        if self.callback:
+            self.callback(keyword, idx)
+        return True
+    
+    def start_listening(self, callback=None, capture=True):
+        """
+        Start simple wake word detection.
+        
+        Args:
+            callback (function): Called with (keyword, keyword_index) on detection
+            capture (bool): Record from the microphone; pass False to supply
+                audio yourself through feed_audio()
+        """
+        if self.transcriber is None:
+            self.logger.warning("Simple wake word detection needs a transcriber")
+            return False
+        
+        # The ring buffer has a single reader, so only one loop may run at a time
+        thread = self._listen_thread
+        if thread is not None and thread.is_alive():
+            if not self._stop_event.is_set():
+                self.logger.debug("Simple wake word detection already running")
+                return True
+            thread.join(timeout=LISTEN_STOP_TIMEOUT)
+            if thread.is_alive():
+                self.logger.warning("Previous listen loop is still transcribing - not starting another")
+                return False
+        
         self.callback = callback
         self.is_listening = True
+        self._stop_event = threading.Event()
+        
+        if self._ring is None:
+            import numpy as np
+            self._ring = np.zeros(RING_FRAMES * FRAME_SAMPLES, dtype=np.int16)
+            self._utterance = np.zeros(UTTERANCE_FRAMES * FRAME_SAMPLES, dtype=np.int16)
+            self._frombuffer = np.frombuffer
+        # Skip audio from a previous session, starting at the next frame boundary
+        self._read_idx = -(-self._write_idx // FRAME_SAMPLES) * FRAME_SAMPLES
+        
+        if capture and not self._open_microphone():
+            self.is_listening = False
+            return False
         
         # Start listening thread
-        listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
-        listen_thread.start()
+        self._listen_thread = threading.Thread(
+            target=self._listen_loop, args=(self._stop_event,), daemon=True
+        )
+        self._listen_thread.start()
         
         self.logger.info("Simple wake word detection started")
+        return True
     
     def stop_listening(self):
-        """Stop wake word detection."""
+        """Stop wake word detection and wait briefly for the listen loop to exit."""
         self.is_listening = False
+        self._stop_event.set()
+        self._close_microphone()
+        
+        # A callback stopping detection runs on the listen thread itself
+        thread = self._listen_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=LISTEN_STOP_TIMEOUT)
+            if thread.is_alive():
+                self.logger.warning("Listen loop still transcribing; it exits when STT returns")
         self.logger.info("Simple wake word detection stopped")
     
-    def _listen_loop(self):
-        """Simple listening loop using STT."""
+    def _open_microphone(self):
+        """Open a callback-mode input stream that writes into the ring via feed_audio()."""
         try:
-            # This would need integration with STT system
-            # For now, just log that it's running
-            while self.is_listening:
-                # In a real implementation, this would:
-                # 1. Record short audio chunks
-                # 2. Use STT to convert to text
-                # 3. Check if text contains wake words
-                # 4. Call callback if detected
-                
-                time.sleep(1)  # Placeholder
+            import pyaudio
+        except ImportError:
+            self.logger.error("pyaudio not available for simple wake word detection")
+            return False
+        
+        def audio_callback(in_data, frame_count, time_info, status):
+            self.feed_audio(in_data)
+            return (None, pyaudio.paContinue)
+        
+        try:
+            self._audio_interface = pyaudio.PyAudio()
+            self._stream = self._audio_interface.open(
+                format=pyaudio.paInt16,
+                channels=1,
+                rate=SAMPLE_RATE,
+                input=True,
+                frames_per_buffer=FRAME_SAMPLES,
+                stream_callback=audio_callback
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Microphone capture failed: {e}")
+            self._close_microphone()
+            return False
+    
+    def _close_microphone(self):
+        """Stop and release the input stream, if one is open."""
+        stream, self._stream = self._stream, None
+        audio_interface, self._audio_interface = self._audio_interface, None
+        try:
+            if stream is not None:
+                stream.stop_stream()
+                stream.close()
+        except Exception as e:
+            self.logger.error(f"Failed to close microphone stream: {e}")
+        finally:
+            if audio_interface is not None:
+                audio_interface.terminate()
+    
+    def feed_audio(self, pcm):
+        """
+        Append 16 kHz mono int16 audio (bytes or array) to the ring buffer.
+        
+        Meant to be called from the audio input callback; it only copies into
+        the preallocated ring and never blocks.
+        """
+        ring = self._ring
+        if ring is None:
+            return
+        if not hasattr(pcm, 'dtype'):
+            pcm = self._frombuffer(pcm, dtype=ring.dtype)
+        
+        size = ring.shape[0]
+        if pcm.shape[0] > size:
+            pcm = pcm[-size:]
+        n = pcm.shape[0]
+        start = self._write_idx % size
+        first = min(n, size - start)
+        ring[start:start + first] = pcm[:first]
+        ring[:n - first] = pcm[first:]
+        
+        # Publish only after the samples are in place
+        self._write_idx += n
+    
+    def _next_frame(self):
+        """Next unread FRAME_SAMPLES frame as a view into the ring, or None if none is complete."""
+        size = self._ring.shape[0]
+        oldest = self._write_idx - size + FRAME_SAMPLES
+        if self._read_idx < oldest:
+            # The writer lapped us; resume at the oldest frame boundary, one frame
+            # clear of the slot being written
+            self._read_idx = -(-oldest // FRAME_SAMPLES) * FRAME_SAMPLES
+        if self._write_idx - self._read_idx < FRAME_SAMPLES:
+            return None
+        
+        # Frames are aligned to FRAME_SAMPLES and the ring holds whole frames, so a frame never wraps
+        start = self._read_idx % size
+        self._read_idx += FRAME_SAMPLES
+        return self._ring[start:start + FRAME_SAMPLES]
+    
+    def _listen_loop(self, stop_event):
+        """Simple listening loop using STT, until this session's stop_event is set."""
+        voiced = 0  # frames in the current utterance
+        silent = 0  # silent frames since the last voiced one
+        try:
+            # wait() returns as soon as stop_listening() sets the event
+            while not stop_event.wait(self.poll_interval):
+                frame = self._next_frame()
+                while frame is not None and not stop_event.is_set():
+                    # Silence never reaches STT: only voiced stretches are collected
+                    if self.has_voice(frame):
+                        start = voiced * FRAME_SAMPLES
+                        self._utterance[start:start + FRAME_SAMPLES] = frame
+                        voiced += 1
+                        silent = 0
+                    elif voiced:
+                        silent += 1
+                    
+                    if voiced == UTTERANCE_FRAMES or (voiced and silent >= UTTERANCE_END_FRAMES):
+                        self._transcribe_utterance(voiced)
+                        voiced = silent = 0
+                    frame = self._next_frame()
                 
         except Exception as e:
             self.logger.error(f"Simple wake word detection error: {e}")
     
+    def _transcribe_utterance(self, frames):
+        """Run STT on the first `frames` collected frames and check the text for wake words."""
+        fd, wav_path = tempfile.mkstemp(suffix=".wav", prefix="wakeword_")
+        try:
+            with os.fdopen(fd, 'wb') as f, wave.open(f, 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(SAMPLE_RATE)
+                wav.writeframes(self._utterance[:frames * FRAME_SAMPLES].tobytes())
+            text = self.transcriber(wav_path)
+            if text:
+                self.process_text(text)
+        except Exception as e:
+            self.logger.error(f"Simple wake word transcription failed: {e}")
+        finally:
+            try:
+                os.unlink(wav_path)
+            except OSError:
+                pass
+    
     def get_info(self):
         """Get detector information."""
         return {
             "name": "Simple Wake Word Detector",
             "description": "Basic wake word detection using STT",
             "keywords": self.keywords,
-            "threshold": self.threshold
+            "threshold": self.threshold,
+            "energy_threshold": self.energy_threshold,
+            "jit": importlib.util.find_spec('numba') is not None
         }
 
 